@@ -0,0 +1,191 @@
+import json
+import platform
+import tracemalloc
+from argparse import ArgumentParser
+from fractions import Fraction
+from itertools import product
+from random import Random
+from time import perf_counter, strftime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from real_number import RN
+from surreal_number import BSN, SN, SNC, compare, compare_cache, get_operation_cache, surreal_numbers
+
+def _reset_caches() -> None:  # 每次测量前清空缓存，保证测的是冷启动的开销
+    compare_cache.clear()
+    cache = get_operation_cache()
+    if cache is not None:
+        cache.clear()
+
+def _cache_counts() -> Dict[str, int]:
+    result = {'compare_hits': compare_cache.hits, 'compare_misses': compare_cache.misses}
+    cache = get_operation_cache()
+    if cache is not None:
+        result.update(operation_hits=cache.hits, operation_misses=cache.misses)
+    
+    return result
+
+def measure(name: str, params: Dict[str, object], function: Callable[[], int], repeat: int = 3) -> Dict[str, object]:  # function 返回它执行的运算次数
+    seconds = []
+    for _ in range(repeat):
+        _reset_caches()
+        start = perf_counter()
+        calls = function()
+        seconds.append(perf_counter() - start)
+    counts = _cache_counts()  # 最后一次运行中缓存的命中情况，反映实际做了多少次递归求值
+    
+    _reset_caches()
+    tracemalloc.start()  # 单独运行一次统计内存，避免 tracemalloc 影响计时
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    best = min(seconds)
+    return {
+        'name': name,
+        'params': params,
+        'calls': calls,
+        'seconds': best,
+        'seconds_per_call': best / calls if calls else 0.0,
+        'seconds_all': seconds,
+        'peak_memory_bytes': peak,
+        'counts': counts,
+    }
+
+def _pairs(day: int, pairs: int, seed: int, cls: type = SN) -> List[Tuple[SN, SN]]:  # 从第 day 天诞生的数中取若干对
+    numbers = list(surreal_numbers(day, day, cls))
+    combinations = list(product(numbers, numbers))
+    Random(seed).shuffle(combinations)
+    
+    return combinations[:pairs]
+
+def surreal_cases(days: Sequence[int], pairs: int, seed: int, repeat: int) -> List[Dict[str, object]]:
+    results = []
+    for day in days:
+        params = {'day': day, 'pairs': pairs}
+        operands = _pairs(day, pairs, seed)
+        basic_operands = []  # 先排好序并去掉相等的一对，计时部分只有构造本身，也不会提前填充比较缓存
+        for x, y in _pairs(day, pairs, seed, BSN):
+            order = compare(x, y)
+            if order:
+                basic_operands.append((x, y) if order < 0 else (y, x))
+        
+        def construct() -> int:
+            for lower, upper in basic_operands:
+                BSN(left={lower}, right={upper})  # 构造时会检查合法性
+            return len(basic_operands)
+        
+        def less_equal() -> int:
+            for x, y in operands:
+                x <= y
+            return len(operands)
+        
+        def add() -> int:
+            for x, y in operands:
+                x + y
+            return len(operands)
+        
+        def sub() -> int:
+            for x, y in operands:
+                x - y
+            return len(operands)
+        
+        def mul() -> int:
+            for x, y in operands:
+                x * y
+            return len(operands)
+        
+        def add_member() -> int:
+            count = 0
+            for x, y in operands:
+                group = SNC(x)
+                group.add_member(x + (y - y))  # 与 x 相等但形式不同的数
+                group.add_member(y)
+                count += 2
+            return count
+        
+        for name, function in [
+            ('BasicSurrealNumber.__init__', construct),
+            ('BasicSurrealNumber.__le__', less_equal),
+            ('SurrealNumber.__add__', add),
+            ('SurrealNumber.__sub__', sub),
+            ('SurrealNumber.__mul__', mul),
+            ('SurrealNumberClass.add_member', add_member),
+        ]:
+            results.append(measure(name, params, function, repeat))
+    
+    return results
+
+def rational_cases(sizes: Sequence[int], pairs: int, seed: int, repeat: int) -> List[Dict[str, object]]:
+    results = []
+    for size in sizes:
+        params = {'bits': size, 'pairs': pairs}
+        generator = Random(seed)
+        rationals = []
+        fractions = []
+        for _ in range(pairs):
+            numbers = [generator.getrandbits(size) + 1 for _ in range(4)]  # 分子分母都不为 0
+            sign = generator.choice([1, -1])
+            rationals.append((RN(numbers[0], numbers[1], sign), RN(numbers[2], numbers[3])))
+            fractions.append((Fraction(sign * numbers[0], numbers[1]), Fraction(numbers[2], numbers[3])))
+        
+        for label, operands in [('RationalNumber', rationals), ('Fraction', fractions)]:
+            for symbol, operation in [
+                ('+', lambda x, y: x + y),
+                ('-', lambda x, y: x - y),
+                ('*', lambda x, y: x * y),
+                ('/', lambda x, y: x / y),
+                ('<', lambda x, y: x < y),
+                ('<=', lambda x, y: x <= y),
+                ('==', lambda x, y: x == y),
+            ]:
+                def loop(operation: Callable = operation, operands: List[Tuple] = operands) -> int:
+                    for x, y in operands:
+                        operation(x, y)
+                    return len(operands)
+                
+                results.append(measure(f'{label} {symbol}', params, loop, repeat))
+    
+    return results
+
+def run(
+    days: Sequence[int] = (0, 1, 2, 3, 4),
+    sizes: Sequence[int] = (8, 64, 512),
+    pairs: int = 32,
+    seed: int = 0,
+    repeat: int = 3,
+    output: Optional[str] = None
+) -> Dict[str, object]:
+    report = {
+        'python': platform.python_version(),
+        'time': strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': surreal_cases(days, pairs, seed, repeat) + rational_cases(sizes, pairs * 16, seed, repeat),
+    }
+    
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2)
+    
+    return report
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    parser = ArgumentParser(description='Benchmark surreal and real number operations.')
+    parser.add_argument('--days', type=int, nargs='+', default=[0, 1, 2, 3, 4], help='birth days of surreal operands')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 64, 512], help='bit sizes of rational operands')
+    parser.add_argument('--pairs', type=int, default=32, help='operand pairs per surreal case (x16 for rationals)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help='write the JSON report to this file')
+    options = parser.parse_args(arguments)
+    
+    report = run(options.days, options.sizes, options.pairs, options.seed, options.repeat, options.output)
+    for result in report['results']:
+        print(
+            f"{result['name']:<32} {json.dumps(result['params']):<28} "
+            f"{result['seconds'] * 1000:>10.3f} ms {result['calls']:>8} calls {result['peak_memory_bytes']:>12} B"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+import json
+from os import remove
+from tempfile import mkstemp
+from unittest import TestCase, main
+
+from benchmark import run
+
+class BenchmarkTest(TestCase):
+    
+    def test_report(self) -> None:
+        _, path = mkstemp(suffix='.json')
+        try:
+            report = run(days=[1, 2], sizes=[8], pairs=4, repeat=1, output=path)
+            with open(path) as file:
+                self.assertEqual(json.load(file), report)  # 输出的 JSON 与返回值一致
+        finally:
+            remove(path)
+        
+        names = {result['name'] for result in report['results']}
+        self.assertIn('SurrealNumber.__mul__', names)
+        self.assertIn('BasicSurrealNumber.__le__', names)
+        self.assertIn('RationalNumber <', names)
+        self.assertIn('Fraction <', names)
+        
+        for result in report['results']:
+            self.assertGreaterEqual(result['seconds'], 0)
+            self.assertGreater(result['peak_memory_bytes'], 0)
+            self.assertIn('compare_misses', result['counts'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+from fractions import Fraction
+from sys import hash_info
+from typing import FrozenSet, Union
+
+from real_number import RationalNumber
+from surreal_number import BasicSurrealNumber, SurrealNumber, from_value, order_key
+
+class DyadicNumber(object):  # 有限天内诞生的数都是二进有理数，直接存 numerator / 2^exponent，运算只需常数次大整数运算
+    
+    __slots__ = ['numerator', 'exponent']
+    
+    def __init__(self, numerator: int = 0, exponent: int = 0) -> None:
+        if exponent < 0:
+            numerator <<= -exponent
+            exponent = 0
+        
+        if numerator == 0:
+            exponent = 0
+        elif exponent:
+            shift = min((numerator & -numerator).bit_length() - 1, exponent)  # 约掉分子末尾的 0，保证表示唯一
+            numerator >>= shift
+            exponent -= shift
+        
+        self.numerator = numerator
+        self.exponent = exponent
+    
+    @classmethod
+    def _from_normalized(cls, numerator: int, exponent: int) -> 'DyadicNumber':  # 已经约分过的结果不必再走 __init__
+        result = object.__new__(cls)
+        result.numerator = numerator
+        result.exponent = exponent
+        
+        return result
+    
+    @classmethod
+    def from_fraction(cls, value: Fraction) -> 'DyadicNumber':
+        denominator = value.denominator
+        if denominator & (denominator - 1):
+            raise ArithmeticError(f'Not a dyadic rational: {value}.')  # 分母必须是 2 的幂
+        
+        return cls._from_normalized(value.numerator, denominator.bit_length() - 1)
+    
+    @classmethod
+    def from_surreal(cls, number: BasicSurrealNumber) -> 'DyadicNumber':
+        return cls.from_fraction(order_key(number))
+    
+    @classmethod
+    def from_rational(cls, number: RationalNumber) -> 'DyadicNumber':
+        return cls.from_fraction(Fraction(number.sign * number.numerator, number.denominator))
+    
+    def to_fraction(self) -> Fraction:
+        return Fraction(self.numerator, 1 << self.exponent)
+    
+    def to_surreal(self, cls: type = SurrealNumber) -> BasicSurrealNumber:  # 得到最简单的形式
+        return from_value(self.to_fraction(), cls)
+    
+    def to_rational(self) -> RationalNumber:
+        return RationalNumber(abs(self.numerator), 1 << self.exponent, -1 if self.numerator < 0 else 1)
+    
+    @property
+    def left(self) -> FrozenSet['DyadicNumber']:  # 按最简规则现场生成选项，兼容按树形结构处理数的代码
+        if self.exponent:
+            return frozenset({self.__class__(self.numerator - 1, self.exponent)})  # p / 2^k = { (p-1) / 2^k | (p+1) / 2^k }
+        if self.numerator > 0:
+            return frozenset({self._from_normalized(self.numerator - 1, 0)})
+        
+        return frozenset()
+    
+    @property
+    def right(self) -> FrozenSet['DyadicNumber']:
+        if self.exponent:
+            return frozenset({self.__class__(self.numerator + 1, self.exponent)})
+        if self.numerator < 0:
+            return frozenset({self._from_normalized(self.numerator + 1, 0)})
+        
+        return frozenset()
+    
+    @classmethod
+    def _coerce(
+        cls,
+        other: Union['DyadicNumber', int, Fraction, RationalNumber, BasicSurrealNumber],
+        forms: bool = True
+    ) -> 'DyadicNumber':  # forms 为 False 时不接受形式，形式的 == 比较结构，比较大小时也不与形式混用
+        if isinstance(other, cls):
+            return other
+        if isinstance(other, int):
+            return cls._from_normalized(other, 0)
+        if isinstance(other, Fraction):
+            return cls.from_fraction(other)
+        if isinstance(other, RationalNumber):
+            return cls.from_rational(other)
+        if forms and isinstance(other, BasicSurrealNumber):
+            return cls.from_surreal(other)
+        
+        return NotImplemented
+    
+    def __add__(self, other: Union['DyadicNumber', int]) -> 'DyadicNumber':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        if self.exponent >= other.exponent:  # 通分到较大的指数
+            return self.__class__(self.numerator + (other.numerator << (self.exponent - other.exponent)), self.exponent)
+        
+        return self.__class__((self.numerator << (other.exponent - self.exponent)) + other.numerator, other.exponent)
+    
+    __radd__ = __add__
+    
+    def __neg__(self) -> 'DyadicNumber':
+        return self._from_normalized(-self.numerator, self.exponent)
+    
+    def __sub__(self, other: Union['DyadicNumber', int]) -> 'DyadicNumber':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return self + (-other)
+    
+    def __rsub__(self, other: Union['DyadicNumber', int]) -> 'DyadicNumber':
+        return -self + other
+    
+    def __mul__(self, other: Union['DyadicNumber', int]) -> 'DyadicNumber':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return self.__class__(self.numerator * other.numerator, self.exponent + other.exponent)  # 奇数乘奇数仍是奇数，一般不需要再约分
+    
+    __rmul__ = __mul__
+    
+    def _compare(self, other: 'DyadicNumber') -> int:
+        if self.exponent >= other.exponent:
+            first, second = self.numerator, other.numerator << (self.exponent - other.exponent)
+        else:
+            first, second = self.numerator << (other.exponent - self.exponent), other.numerator
+        
+        return (first > second) - (first < second)
+    
+    def _order(self, other: Union['DyadicNumber', int, Fraction, RationalNumber]) -> int:  # 与数值比较，Fraction 和 RationalNumber 不一定是二进有理数，交叉相乘精确比较
+        if isinstance(other, RationalNumber):
+            other = other.to_fraction()
+        if isinstance(other, Fraction):
+            first, second = self.numerator * other.denominator, other.numerator << self.exponent
+            return (first > second) - (first < second)
+        
+        other = self._coerce(other, forms=False)
+        if other is NotImplemented:
+            return other
+        
+        return self._compare(other)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, DyadicNumber):
+            return self.numerator == other.numerator and self.exponent == other.exponent  # 表示唯一，不需要通分
+        
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result == 0
+    
+    def __hash__(self) -> int:  # 与数值相等的 int 和 Fraction 的哈希值一致
+        modulus = hash_info.modulus
+        result = abs(self.numerator) % modulus * pow(2, -self.exponent, modulus) % modulus
+        result = result if self.numerator >= 0 else -result
+        
+        return -2 if result == -1 else result
+    
+    def __lt__(self, other: Union['DyadicNumber', int, Fraction, RationalNumber]) -> bool:
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result < 0
+    
+    def __le__(self, other: Union['DyadicNumber', int, Fraction, RationalNumber]) -> bool:
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result <= 0
+    
+    def __gt__(self, other: Union['DyadicNumber', int, Fraction, RationalNumber]) -> bool:
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result > 0
+    
+    def __ge__(self, other: Union['DyadicNumber', int, Fraction, RationalNumber]) -> bool:
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result >= 0
+    
+    def __str__(self) -> str:
+        if not self.exponent:
+            return str(self.numerator)
+        
+        return f'{self.numerator} / {1 << self.exponent}'
+
+DN = DyadicNumber
+
+__all__ = ['DN', 'DyadicNumber']
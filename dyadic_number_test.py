@@ -0,0 +1,91 @@
+from fractions import Fraction
+from random import randint
+from unittest import TestCase, main
+
+from dyadic_number import DN
+from real_number import RN
+from surreal_number import SN, compare
+
+class DyadicNumberTest(TestCase):
+    
+    def test_construct(self) -> None:
+        num = DN(12, 3)
+        self.assertEqual(num.numerator, 3)  # 12 / 8 = 3 / 2
+        self.assertEqual(num.exponent, 1)
+        
+        num = DN(3, -2)
+        self.assertEqual(num.numerator, 12)
+        self.assertEqual(num.exponent, 0)
+        
+        self.assertEqual(DN(0, 5).exponent, 0)
+        self.assertEqual(str(DN(-3, 2)), '-3 / 4')
+        self.assertEqual(str(DN(4, 2)), '1')
+    
+    def test_compute(self) -> None:
+        for _ in range(100):
+            a = DN(randint(-1000, 1000), randint(0, 10))
+            a_copy = a.to_fraction()
+            b = DN(randint(-1000, 1000), randint(0, 10))
+            b_copy = b.to_fraction()
+            
+            self.assertEqual((a + b).to_fraction(), a_copy + b_copy)
+            self.assertEqual((a - b).to_fraction(), a_copy - b_copy)
+            self.assertEqual((a * b).to_fraction(), a_copy * b_copy)
+            self.assertEqual((-a).to_fraction(), -a_copy)
+            self.assertEqual(a < b, a_copy < b_copy)
+            self.assertEqual(a >= b, a_copy >= b_copy)
+            self.assertEqual(hash(a), hash(a_copy))  # 与 Fraction 可以混用在集合中
+        
+        self.assertEqual(DN(1, 1) + 1, DN(3, 1))
+        self.assertEqual(2 * DN(1, 2), DN(1, 1))
+        self.assertEqual(DN(1, 1) + Fraction(1, 4), DN(3, 2))
+        with self.assertRaises(ArithmeticError):
+            DN(1, 1) + Fraction(1, 3)
+    
+    def test_compare(self) -> None:
+        self.assertEqual(DN(1, 1), Fraction(1, 2))
+        self.assertEqual(Fraction(1, 2), DN(1, 1))
+        self.assertEqual(DN(-3, 2), RN(3, 4, -1))
+        self.assertEqual(RN(3, 4, -1), DN(-3, 2))
+        self.assertEqual(len({DN(1, 1), Fraction(1, 2), RN(1, 2)}), 1)
+        self.assertNotEqual(DN(1, 1), Fraction(1, 3))
+        self.assertTrue(DN(1, 1) > Fraction(1, 3))
+        self.assertTrue(DN(1, 1) <= RN(1, 2))
+        self.assertTrue(Fraction(1, 3) < DN(1, 1))
+        
+        zero = SN()
+        self.assertNotEqual(DN(0), zero)  # 形式按结构比较，与数值不混用，== 与比较大小的结果一致
+        with self.assertRaises(TypeError):
+            DN(0) <= zero
+        with self.assertRaises(TypeError):
+            zero >= DN(0)
+    
+    def test_options(self) -> None:
+        self.assertEqual(DN(3, 2).left, {DN(1, 1)})  # 3/4 = { 1/2 | 1 }
+        self.assertEqual(DN(3, 2).right, {DN(1)})
+        self.assertEqual(DN(2).left, {DN(1)})
+        self.assertEqual(DN(2).right, set())
+        self.assertEqual(DN(-2).right, {DN(-1)})
+        self.assertEqual(DN().left, set())
+    
+    def test_convert(self) -> None:
+        zero = SN()
+        one = SN(left={zero})
+        half = SN(left={zero}, right={one})
+        
+        self.assertEqual(DN.from_surreal(half), DN(1, 1))
+        self.assertEqual(DN.from_surreal(SN(left={SN(right={zero})}, right={one})), DN(0))  # { -1 | 1 } = 0
+        self.assertIs(DN(1, 1).to_surreal(), half)
+        self.assertEqual(compare(DN(-9, 3).to_surreal(), SN(right={zero}) - half * half * half), 0)
+        
+        self.assertEqual(DN.from_rational(RN(6, 8, -1)), DN(-3, 2))
+        self.assertTrue(DN(-3, 2).to_rational() == RN(3, 4, -1))
+        with self.assertRaises(ArithmeticError):
+            DN.from_rational(RN(1, 3))
+        
+        for _ in range(20):
+            num = DN(randint(-100, 100), randint(0, 4))
+            self.assertEqual(DN.from_surreal(num.to_surreal()), num)
+
+if __name__ == '__main__':
+    main()
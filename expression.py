@@ -0,0 +1,165 @@
+from typing import Iterator, Optional, Tuple, Union
+from weakref import WeakValueDictionary
+
+from surreal_number import SurrealNumber, get_canonical_mode, order_key
+
+_nodes = WeakValueDictionary()  # 结构相同的表达式只保留一个节点，重复的子表达式自然被合并
+
+class Expression(object):  # 延迟求值的表达式，运算符只构造有向无环图，比较、str() 或 evaluate() 时才计算
+    
+    __slots__ = ['operator', 'operands', 'cls', '_result', '__weakref__']
+    
+    def __new__(cls, operator: str, *operands: Union['Expression', SurrealNumber]) -> 'Expression':
+        if operator == 'leaf':
+            number_class = operands[0].__class__
+        else:
+            if operator in ('+', '*') and id(operands[0]) > id(operands[1]):
+                operands = operands[1], operands[0]  # 加法和乘法满足交换律，统一操作数顺序
+            number_class = operands[0].cls
+        
+        key = (operator, operands)
+        self = _nodes.get(key)
+        if self is None:
+            self = object.__new__(cls)
+            self.operator = operator
+            self.operands = operands
+            self.cls = number_class
+            self._result = None  # (规范化方式, 结果)，规范化方式改变后需要重新计算
+            _nodes[key] = self
+        
+        return self
+    
+    @classmethod
+    def _coerce(cls, other: Union['Expression', SurrealNumber]) -> 'Expression':
+        if isinstance(other, cls):
+            return other
+        if isinstance(other, SurrealNumber):
+            return cls('leaf', other)
+        
+        return NotImplemented
+    
+    def _constant(self) -> Optional[int]:  # 叶子的值为 0 或 1 时返回该值，用于化简
+        if self.operator == 'leaf':
+            value = order_key(self.operands[0])
+            if value == 0 or value == 1:
+                return int(value)
+        
+        return None
+    
+    def _zero(self) -> 'Expression':
+        return self.__class__('leaf', self.cls())
+    
+    def __add__(self, other: Union['Expression', SurrealNumber]) -> 'Expression':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        if self._constant() == 0:  # 0 + x = x
+            return other
+        if other._constant() == 0:
+            return self
+        if (self.operator == '-' and self.operands[0] is other) or (other.operator == '-' and other.operands[0] is self):
+            return self._zero()  # x - x = 0
+        
+        return self.__class__('+', self, other)
+    
+    __radd__ = __add__
+    
+    def __neg__(self) -> 'Expression':
+        if self.operator == '-':
+            return self.operands[0]  # -(-x) = x
+        if self._constant() == 0:
+            return self
+        
+        return self.__class__('-', self)
+    
+    def __sub__(self, other: Union['Expression', SurrealNumber]) -> 'Expression':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return self + (-other)
+    
+    def __rsub__(self, other: SurrealNumber) -> 'Expression':
+        return -self + other
+    
+    def __mul__(self, other: Union['Expression', SurrealNumber]) -> 'Expression':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        constants = self._constant(), other._constant()
+        if 0 in constants:  # 0 * x = 0
+            return self._zero()
+        if constants[0] == 1:  # 1 * x = x
+            return other
+        if constants[1] == 1:
+            return self
+        
+        return self.__class__('*', self, other)
+    
+    __rmul__ = __mul__
+    
+    def _children(self) -> Iterator['Expression']:
+        return iter(self.operands if self.operator != 'leaf' else ())
+    
+    def evaluate(self) -> SurrealNumber:  # 按后序遍历求值，每个节点只算一次，不使用递归
+        mode = get_canonical_mode()
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if node._result is not None and node._result[0] == mode:
+                stack.pop()
+                continue
+            
+            pending = [child for child in node._children() if child._result is None or child._result[0] != mode]
+            if pending:
+                stack.extend(pending)
+                continue
+            
+            stack.pop()
+            if node.operator == 'leaf':
+                result = node.operands[0]
+            elif node.operator == '-':
+                result = -node.operands[0]._result[1]
+            elif node.operator == '+':
+                result = node.operands[0]._result[1] + node.operands[1]._result[1]
+            else:
+                result = node.operands[0]._result[1] * node.operands[1]._result[1]
+            node._result = (mode, result)
+        
+        return self._result[1]
+    
+    def _operands(self, other: Union['Expression', SurrealNumber]) -> Tuple[SurrealNumber, SurrealNumber]:
+        if isinstance(other, Expression):
+            other = other.evaluate()
+        
+        return self.evaluate(), other
+    
+    def __le__(self, other: Union['Expression', SurrealNumber]) -> bool:
+        x, y = self._operands(other)
+        return x <= y
+    
+    def __ge__(self, other: Union['Expression', SurrealNumber]) -> bool:
+        x, y = self._operands(other)
+        return x >= y
+    
+    def __lt__(self, other: Union['Expression', SurrealNumber]) -> bool:
+        x, y = self._operands(other)
+        return not y <= x
+    
+    def __gt__(self, other: Union['Expression', SurrealNumber]) -> bool:
+        x, y = self._operands(other)
+        return not x <= y
+    
+    def __str__(self) -> str:
+        return str(self.evaluate())
+
+def defer(number: Union[Expression, SurrealNumber]) -> Expression:  # 从一个数开始构造表达式，之后的运算都是延迟的
+    result = Expression._coerce(number)
+    if result is NotImplemented:
+        raise TypeError(f'Cannot defer {number.__class__.__name__}.')
+    
+    return result
+
+__all__ = ['Expression', 'defer']
@@ -0,0 +1,48 @@
+from unittest import TestCase, main
+
+from expression import Expression, defer
+from surreal_number import SN, canonical_forms, compare, surreal_numbers
+
+class ExpressionTest(TestCase):
+    
+    def test_shared_subexpressions(self) -> None:
+        numbers = list(surreal_numbers(last_day=2))
+        a, b, c = defer(numbers[1]), defer(numbers[3]), defer(numbers[2])
+        self.assertIs(a * b, b * a)
+        
+        expression = a * b + a * b - c
+        doubled = a * b + a * b
+        self.assertIn(doubled, expression.operands)
+        self.assertIs(doubled.operands[0], doubled.operands[1])  # a * b 只有一个节点
+        self.assertIsNone(expression._result)
+        
+        with canonical_forms(simplify=True):
+            result = expression.evaluate()
+            expected = numbers[1] * numbers[3] + numbers[1] * numbers[3] - numbers[2]
+            self.assertEqual(compare(result, expected), 0)
+            self.assertEqual(str(expression), str(result))
+    
+    def test_identities(self) -> None:
+        zero = SN()
+        one = SN(left={zero})
+        x = defer(SN(right={zero}))
+        self.assertIs(x + zero, x)
+        self.assertIs(one * x, x)
+        self.assertIs(-(-x), x)
+        self.assertIs((x - x).operands[0], zero)
+        self.assertIs((x * zero).operands[0], zero)
+        self.assertIsInstance(x * x, Expression)
+    
+    def test_compare(self) -> None:
+        zero = SN()
+        one = SN(left={zero})
+        x = defer(one) + one
+        self.assertTrue(x >= one)
+        self.assertTrue(x > one)
+        self.assertFalse(x < one)
+        self.assertTrue(defer(one) - one <= zero)
+        with self.assertRaises(TypeError):
+            defer(1)
+
+if __name__ == '__main__':
+    main()
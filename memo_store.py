@@ -0,0 +1,229 @@
+import sqlite3
+from hashlib import sha256
+from itertools import product
+from struct import error as StructError
+from time import time_ns
+from typing import Hashable, Iterable, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from serialization import dumps, loads
+from surreal_number import BasicSurrealNumber, CacheInfo, LRUCache, surreal_numbers, use_operation_cache
+
+_digests = WeakKeyDictionary()  # 节点到结构摘要的缓存，节点回收后自动删除
+
+def structural_digest(number: BasicSurrealNumber) -> bytes:  # 与构造顺序和进程无关的结构摘要，左右集合按摘要排序
+    if number in _digests:
+        return _digests[number]
+    
+    stack = [number]  # 用栈代替递归
+    while stack:
+        node = stack[-1]
+        pending = [member for member in node.left | node.right if member not in _digests]
+        if pending:
+            stack.extend(pending)
+            continue
+        
+        stack.pop()
+        digest = sha256(b'{')
+        digest.update(b''.join(sorted(_digests[member] for member in node.left)))
+        digest.update(b'|')
+        digest.update(b''.join(sorted(_digests[member] for member in node.right)))
+        digest.update(b'}')
+        _digests[node] = digest.digest()
+    
+    return _digests[number]
+
+class PersistentMemoStore(object):  # 把运算结果保存在 SQLite 文件中，实现了 get 和 put，可以传给 use_operation_cache
+    
+    __slots__ = [
+        'path', 'max_entries', 'max_bytes', 'batch_size', 'hits', 'misses', 'corrupted',
+        '_connection', '_memory', '_entries', '_bytes', '_touched', '_pending'
+    ]
+    
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1 << 20,
+        max_bytes: Optional[int] = None,
+        memory_size: int = 1 << 14,
+        batch_size: int = 256
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size  # 每写入这么多条记录提交一次，逐条提交太慢
+        self.hits = 0
+        self.misses = 0
+        self.corrupted = 0  # 校验失败而被丢弃的记录数
+        self._memory = LRUCache(memory_size) if memory_size else None  # 进程内的一级缓存，避免反复查询数据库
+        self._touched = []  # 命中但还没写回的访问时间
+        self._pending = 0  # 还没提交的写入次数
+        
+        self._connection = sqlite3.connect(path, timeout=30)  # 多个进程可以共用同一个文件
+        if self._connection.execute('PRAGMA quick_check').fetchone()[0] != 'ok':
+            self._connection.close()
+            raise sqlite3.DatabaseError(f'Corrupted memo store: {path}.')
+        
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'key BLOB PRIMARY KEY, value BLOB NOT NULL, checksum BLOB NOT NULL, last_used INTEGER NOT NULL)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+        self._connection.commit()
+        self._count()
+    
+    def _count(self) -> None:
+        self._entries, self._bytes = self._connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM results'
+        ).fetchone()
+    
+    @staticmethod
+    def _key(key: Tuple) -> Tuple[bytes, type]:  # 把 (运算符, [规范化方式,] x, y) 转成跨进程稳定的摘要，同时返回结果的类型
+        operator = key[0]
+        parts = [part for part in key[1:] if isinstance(part, BasicSurrealNumber)]
+        settings = [part for part in key[1:] if not isinstance(part, BasicSurrealNumber)]
+        digests = [structural_digest(part) for part in parts]
+        if operator in ('+', '*'):
+            digests.sort()  # 加法和乘法满足交换律，按摘要统一操作数顺序
+        
+        digest = sha256(repr((operator, settings, parts[0].__class__.__qualname__)).encode())
+        for part in digests:
+            digest.update(part)
+        
+        return digest.digest(), parts[0].__class__
+    
+    def get(self, key: Hashable, default: object = None) -> object:
+        if self._memory is not None:
+            value = self._memory.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+        
+        digest, cls = self._key(key)
+        row = self._connection.execute('SELECT value, checksum FROM results WHERE key = ?', (digest,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        
+        data, checksum = row
+        try:
+            if sha256(data).digest() != checksum:
+                raise ValueError('Checksum mismatch.')
+            value = loads(data, cls)[0]
+        except (ValueError, IndexError, StructError):
+            self.corrupted += 1  # 记录损坏时当作未命中，并删除记录
+            self._connection.execute('DELETE FROM results WHERE key = ?', (digest,))
+            self.flush()
+            self._count()
+            self.misses += 1
+            return default
+        
+        self.hits += 1
+        self._touched.append((time_ns(), digest))
+        if len(self._touched) >= self.batch_size:
+            self.flush()
+        if self._memory is not None:
+            self._memory.put(key, value)
+        
+        return value
+    
+    def put(self, key: Hashable, value: BasicSurrealNumber) -> None:
+        if self._memory is not None:
+            self._memory.put(key, value)
+        
+        data = dumps([value])
+        digest, _ = self._key(key)
+        replaced = self._connection.execute('SELECT LENGTH(value) FROM results WHERE key = ?', (digest,)).fetchone()
+        self._connection.execute(
+            'INSERT OR REPLACE INTO results (key, value, checksum, last_used) VALUES (?, ?, ?, ?)',
+            (digest, data, sha256(data).digest(), time_ns())
+        )
+        if replaced is None:
+            self._entries += 1
+            self._bytes += len(data)
+        else:
+            self._bytes += len(data) - replaced[0]
+        
+        self._pending += 1
+        if self._full():
+            self.flush()
+            self._count()  # 计数只包括本进程的写入，先按数据库中的实际数量重新计算，其他进程可能已经写入或删除了记录
+            if self._full():
+                self._evict()
+        elif self._pending >= self.batch_size:
+            self.flush()
+    
+    def _full(self) -> bool:
+        return self._entries > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes)
+    
+    def _evict(self) -> None:  # 删除最久没有使用的记录，多删一些，避免每次写入都触发
+        self.flush()
+        excess = max(self._entries - self.max_entries, 0) + self.max_entries // 10 + 1
+        if self.max_bytes is not None and self._bytes > self.max_bytes and self._entries:
+            average = self._bytes / self._entries
+            excess = max(excess, int((self._bytes - self.max_bytes) / average) + 1)
+        
+        self._connection.execute(
+            'DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)', (excess,)
+        )
+        self._connection.commit()
+        self._count()
+        if self._memory is not None:
+            self._memory.clear()  # 一级缓存中可能有已删除的记录
+    
+    def flush(self) -> None:  # 写回访问时间并提交
+        if self._touched:
+            self._connection.executemany('UPDATE results SET last_used = ? WHERE key = ?', self._touched)
+            self._touched = []
+        self._connection.commit()
+        self._pending = 0
+    
+    def warm(self, day: int, operators: Iterable[str] = ('+', '*'), cls: Optional[type] = None) -> int:  # 预先计算第 day 天及以前诞生的所有数两两运算的结果
+        numbers = list(surreal_numbers(last_day=day) if cls is None else surreal_numbers(last_day=day, cls=cls))
+        count = 0
+        with use_operation_cache(self):
+            for x, y in product(numbers, numbers):
+                for operator in operators:
+                    if operator == '+':
+                        x + y
+                    elif operator == '*':
+                        x * y
+                    elif operator == '-':
+                        x - y
+                    else:
+                        raise ValueError(f'Unknown operator: {operator}.')
+                    count += 1
+        self.flush()
+        
+        return count
+    
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.max_entries, self._entries)
+    
+    def clear(self) -> None:
+        self._touched = []
+        self._pending = 0
+        self._connection.execute('DELETE FROM results')
+        self._connection.commit()
+        self._count()
+        if self._memory is not None:
+            self._memory.clear()
+        self.hits = 0
+        self.misses = 0
+        self.corrupted = 0
+    
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+    
+    def __len__(self) -> int:
+        return self._entries
+    
+    def __enter__(self) -> 'PersistentMemoStore':
+        return self
+    
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+__all__ = ['PersistentMemoStore', 'structural_digest']
@@ -0,0 +1,90 @@
+import sqlite3
+from os import remove
+from tempfile import mkstemp
+from unittest import TestCase, main
+
+from memo_store import PersistentMemoStore, structural_digest
+from surreal_number import SN, canonical_forms, surreal_numbers, use_operation_cache
+
+class PersistentMemoStoreTest(TestCase):
+    
+    def setUp(self) -> None:
+        _, self.path = mkstemp(suffix='.db')
+    
+    def tearDown(self) -> None:
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+    
+    def test_digest(self) -> None:
+        zero = SN()
+        one = SN(left={zero})
+        self.assertEqual(structural_digest(SN(left={zero, -one})), structural_digest(SN(left={-one, zero})))
+        self.assertNotEqual(structural_digest(one), structural_digest(-one))
+    
+    def test_persist(self) -> None:
+        numbers = list(surreal_numbers(last_day=2))
+        with canonical_forms(simplify=True), PersistentMemoStore(self.path, memory_size=0) as store:
+            count = store.warm(2)
+            self.assertEqual(count, 2 * len(numbers) ** 2)
+            self.assertGreater(len(store), 0)
+            expected = numbers[1] * numbers[3]
+        
+        with canonical_forms(simplify=True), PersistentMemoStore(self.path, memory_size=0) as store:
+            entries = len(store)
+            with use_operation_cache(store):
+                self.assertIs(numbers[3] * numbers[1], expected)  # 另一个顺序的操作数也能命中
+            self.assertEqual(store.info().hits, 1)
+            self.assertEqual(store.info().misses, 0)
+            self.assertEqual(len(store), entries)
+    
+    def test_evict(self) -> None:
+        with canonical_forms(simplify=True), PersistentMemoStore(self.path, max_entries=10, memory_size=0) as store:
+            store.warm(2)
+            self.assertLessEqual(len(store), 10)
+            store.clear()
+            self.assertEqual(len(store), 0)
+    
+    def test_batch(self) -> None:
+        one = SN(left={SN()})
+        connection = sqlite3.connect(self.path)
+        with canonical_forms(simplify=True), PersistentMemoStore(self.path, memory_size=0, batch_size=1000) as store:
+            with use_operation_cache(store):
+                one + one
+            self.assertEqual(connection.execute('SELECT COUNT(*) FROM results').fetchone()[0], 0)  # 写入还没有提交
+            store.flush()
+            self.assertEqual(connection.execute('SELECT COUNT(*) FROM results').fetchone()[0], len(store))
+            entries = len(store)
+        
+        with canonical_forms(simplify=True), PersistentMemoStore(self.path, max_entries=entries, memory_size=0) as store:
+            connection.execute('DELETE FROM results')  # 另一个进程清空了记录，本进程的计数已经过时
+            connection.commit()
+            with use_operation_cache(store):
+                one + one
+            self.assertEqual(len(store), entries)  # 按实际数量判断，没有触发淘汰
+            store.flush()
+            self.assertEqual(connection.execute('SELECT COUNT(*) FROM results').fetchone()[0], len(store))
+        connection.close()
+    
+    def test_corrupted(self) -> None:
+        one = SN(left={SN()})
+        with canonical_forms(simplify=True), PersistentMemoStore(self.path, memory_size=0) as store:
+            with use_operation_cache(store):
+                two = one + one
+            entries = len(store)  # 包括求和过程中的中间结果
+        
+        connection = sqlite3.connect(self.path)
+        connection.execute('UPDATE results SET value = substr(value, 1, 8)')  # 破坏保存的结果
+        connection.commit()
+        connection.close()
+        
+        with canonical_forms(simplify=True), PersistentMemoStore(self.path, memory_size=0) as store:
+            with use_operation_cache(store):
+                self.assertIs(one + one, two)  # 损坏的记录被丢弃后重新计算
+            self.assertEqual(store.corrupted, entries)
+            self.assertEqual(len(store), entries)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+from array import array
+from struct import Struct
+from sys import byteorder
+from typing import Optional
+
+from surreal_number import BasicSurrealNumber, SurrealNumber, compare, from_value, order_key, values_born_on
+
+# 文件格式（小端序）：
+#   文件头    magic, version, 天数, 表项类型（array 的 typecode）
+#   加法表    n * n 个表项，第 i * n + j 项是编号 i 与 j 之和的编号，不在表中为 -1
+#   乘法表    同上
+# 编号按数值从小到大排列，所以取反和比较不需要表
+
+MAGIC = b'SROT'
+VERSION = 1
+
+_HEADER = Struct('<4sIIc')
+
+class OperationTable(object):  # 第 day 天及以前诞生的所有数之间的运算表，数先换成编号，之后的运算只需查表
+    
+    __slots__ = ['day', 'cls', 'numbers', '_ids', '_sums', '_products']
+    
+    def __init__(self, day: int, cls: type = SurrealNumber) -> None:
+        self._setup(day, cls)
+        
+        scale = 1 << max(day - 1, 0)  # 所有数乘以 scale 后都是整数，运算只需整数运算
+        scaled = [int(value * scale) for value in self._ids]
+        ids = {value: index for index, value in enumerate(scaled)}
+        typecode = self._typecode(len(scaled))
+        self._sums = array(typecode)
+        self._products = array(typecode)
+        for first in scaled:
+            self._sums.extend([ids.get(first + second, -1) for second in scaled])
+            self._products.extend([
+                ids.get(first * second // scale, -1) if first * second % scale == 0 else -1 for second in scaled
+            ])
+    
+    def _setup(self, day: int, cls: type) -> None:
+        self.day = day
+        self.cls = cls
+        values = sorted(value for birthday in range(day + 1) for value in values_born_on(birthday))
+        self._ids = {value: index for index, value in enumerate(values)}  # 数值到编号
+        self.numbers = [from_value(value, cls) for value in values]  # 编号到最简单的形式
+    
+    @staticmethod
+    def _typecode(count: int) -> str:  # 选择能放下所有编号和 -1 的最小整数类型
+        for typecode in 'bhi':
+            if count <= 1 << (8 * array(typecode).itemsize - 1):
+                return typecode
+        
+        return 'q'
+    
+    def id(self, number: BasicSurrealNumber) -> Optional[int]:  # 与 number 相等的数的编号，不在表中时返回 None
+        return self._ids.get(order_key(number))
+    
+    def add_ids(self, first: int, second: int) -> int:  # 直接对编号运算，结果不在表中时返回 -1
+        return self._sums[first * len(self.numbers) + second]
+    
+    def mul_ids(self, first: int, second: int) -> int:
+        return self._products[first * len(self.numbers) + second]
+    
+    def neg_id(self, number_id: int) -> int:  # 取值关于 0 对称
+        return len(self.numbers) - 1 - number_id
+    
+    @staticmethod
+    def compare_ids(first: int, second: int) -> int:
+        return (first > second) - (first < second)
+    
+    def add(self, x: SurrealNumber, y: SurrealNumber) -> SurrealNumber:  # 结果在表中时返回最简单的形式，否则使用普通的运算符
+        first, second = self.id(x), self.id(y)
+        if first is not None and second is not None:
+            result = self.add_ids(first, second)
+            if result >= 0:
+                return self.numbers[result]
+        
+        return x + y
+    
+    def neg(self, x: SurrealNumber) -> SurrealNumber:
+        number_id = self.id(x)
+        if number_id is not None:
+            return self.numbers[self.neg_id(number_id)]
+        
+        return -x
+    
+    def sub(self, x: SurrealNumber, y: SurrealNumber) -> SurrealNumber:
+        return self.add(x, self.neg(y))
+    
+    def mul(self, x: SurrealNumber, y: SurrealNumber) -> SurrealNumber:
+        first, second = self.id(x), self.id(y)
+        if first is not None and second is not None:
+            result = self.mul_ids(first, second)
+            if result >= 0:
+                return self.numbers[result]
+        
+        return x * y
+    
+    def compare(self, x: BasicSurrealNumber, y: BasicSurrealNumber) -> int:
+        first, second = self.id(x), self.id(y)
+        if first is not None and second is not None:
+            return self.compare_ids(first, second)
+        
+        return compare(x, y)
+    
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, self.day, self._sums.typecode.encode()))
+            for table in (self._sums, self._products):
+                if byteorder == 'big':
+                    table = array(table.typecode, table)
+                    table.byteswap()
+                table.tofile(file)
+    
+    @classmethod
+    def load(cls, path: str, number_class: type = SurrealNumber) -> 'OperationTable':  # 表直接从文件复制，不需要重新计算
+        with open(path, 'rb') as file:
+            data = file.read()
+        
+        if len(data) < _HEADER.size:
+            raise ValueError('Not an operation table file.')
+        magic, version, day, typecode = _HEADER.unpack_from(data, 0)
+        typecode = typecode.decode('ascii', 'replace')
+        if magic != MAGIC or version != VERSION or typecode not in 'bhiq':
+            raise ValueError('Not an operation table file.')
+        
+        if day >= len(data).bit_length():  # 表的大小至少是 4^day，先用文件长度限制天数，避免计算巨大的整数
+            raise ValueError('Truncated operation table file.')
+        size = ((1 << (day + 1)) - 1) ** 2 * array(typecode).itemsize  # 第 day 天及以前共诞生 2^(day+1) - 1 个数
+        if len(data) != _HEADER.size + 2 * size:
+            raise ValueError('Truncated operation table file.')
+        
+        self = object.__new__(cls)
+        self._setup(day, number_class)
+        tables = []
+        for offset in (_HEADER.size, _HEADER.size + size):
+            table = array(typecode)
+            table.frombytes(data[offset:offset + size])
+            if byteorder == 'big':
+                table.byteswap()
+            tables.append(table)
+        self._sums, self._products = tables
+        
+        return self
+    
+    def __len__(self) -> int:
+        return len(self.numbers)
+    
+    def __contains__(self, number: BasicSurrealNumber) -> bool:
+        return self.id(number) is not None
+
+__all__ = ['OperationTable']
@@ -0,0 +1,64 @@
+from os import remove
+from tempfile import mkstemp
+from unittest import TestCase, main
+
+from operation_table import MAGIC, VERSION, _HEADER, OperationTable
+from surreal_number import SN, canonical_forms, compare, surreal_numbers
+
+class OperationTableTest(TestCase):
+    
+    def setUp(self) -> None:
+        _, self.path = mkstemp(suffix='.sot')
+    
+    def tearDown(self) -> None:
+        remove(self.path)
+    
+    def test_operations(self) -> None:
+        table = OperationTable(3)
+        numbers = list(surreal_numbers(last_day=3))
+        self.assertEqual(len(table), len(numbers))
+        self.assertEqual([table.compare_ids(table.id(x), table.id(y)) for x in numbers for y in numbers], [compare(x, y) for x in numbers for y in numbers])
+        
+        with canonical_forms(simplify=True):
+            for x in numbers:
+                self.assertEqual(compare(table.neg(x), -x), 0)
+                for y in numbers:
+                    self.assertEqual(compare(table.add(x, y), x + y), 0)
+                    self.assertEqual(compare(table.sub(x, y), x - y), 0)
+                    self.assertEqual(compare(table.mul(x, y), x * y), 0)
+    
+    def test_lookup(self) -> None:
+        table = OperationTable(2)
+        zero = SN()
+        one = SN(left={zero})
+        two = SN(left={one})
+        self.assertIs(table.numbers[table.id(one)], one)
+        self.assertEqual(table.id(SN(left={-one, zero})), table.id(one))  # 不是最简单的形式也能找到编号
+        self.assertIs(table.add(SN(left={-one, zero}), one), two)
+        self.assertEqual(table.add_ids(table.id(two), table.id(two)), -1)  # 4 不在表中
+        self.assertEqual(compare(table.add(two, two), two + two), 0)
+        self.assertNotIn(two + two, table)
+        self.assertEqual(table.compare(two + two, two), 1)
+    
+    def test_save(self) -> None:
+        table = OperationTable(4)
+        table.save(self.path)
+        loaded = OperationTable.load(self.path)
+        self.assertEqual(loaded._sums, table._sums)
+        self.assertEqual(loaded._products, table._products)
+        self.assertEqual(loaded.numbers, table.numbers)
+        
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        with open(self.path, 'wb') as file:
+            file.write(data[:-1])
+        with self.assertRaises(ValueError):
+            OperationTable.load(self.path)
+        
+        with open(self.path, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, 0xffffffff, b'b') + data[_HEADER.size:])  # 天数不可信
+        with self.assertRaises(ValueError):
+            OperationTable.load(self.path)
+
+if __name__ == '__main__':
+    main()
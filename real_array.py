@@ -0,0 +1,478 @@
+from fractions import Fraction
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from real_number import IrrationalNumber, RationalNumber
+
+_LIMIT = 1 << 31  # 分子、分母都小于此值时，交叉相乘再相加也不会超出 int64
+
+def _integers(values: object) -> np.ndarray:  # 超出 int64 的整数保存在 object 数组中
+    try:
+        return np.asarray(values, dtype=np.int64)
+    except OverflowError:
+        return np.asarray(values, dtype=object)
+
+def _compact(numerators: np.ndarray, denominators: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:  # 约分后能放进 int64 的结果换回 int64
+    if numerators.dtype == object or denominators.dtype == object:
+        try:
+            return numerators.astype(np.int64), denominators.astype(np.int64)
+        except OverflowError:
+            return numerators.astype(object), denominators.astype(object)
+    
+    return numerators, denominators
+
+def _reduce(numerators: np.ndarray, denominators: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:  # 批量约分，分子带符号
+    common = np.gcd(numerators, denominators)
+    return numerators // common, denominators // common
+
+def _add(
+    first_numerators: np.ndarray,
+    first_denominators: np.ndarray,
+    second_numerators: np.ndarray,
+    second_denominators: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    return _reduce(
+        first_numerators * second_denominators + second_numerators * first_denominators,
+        first_denominators * second_denominators
+    )
+
+def _sub(
+    first_numerators: np.ndarray,
+    first_denominators: np.ndarray,
+    second_numerators: np.ndarray,
+    second_denominators: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    return _reduce(
+        first_numerators * second_denominators - second_numerators * first_denominators,
+        first_denominators * second_denominators
+    )
+
+def _mul(
+    first_numerators: np.ndarray,
+    first_denominators: np.ndarray,
+    second_numerators: np.ndarray,
+    second_denominators: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    return _reduce(first_numerators * second_numerators, first_denominators * second_denominators)
+
+def _truediv(
+    first_numerators: np.ndarray,
+    first_denominators: np.ndarray,
+    second_numerators: np.ndarray,
+    second_denominators: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    if (second_numerators == 0).any():
+        raise ZeroDivisionError('Division by zero.')
+    
+    numerators = first_numerators * second_denominators
+    denominators = first_denominators * second_numerators
+    signs = np.where(denominators < 0, -1, 1)  # 保证分母为正
+    
+    return _reduce(numerators * signs, denominators * signs)
+
+def _apply(function: Callable, *arrays: np.ndarray) -> Tuple[np.ndarray, ...]:  # 可能溢出的元素逐个改用 object 数组计算
+    arrays = np.broadcast_arrays(*arrays)
+    small = np.ones(arrays[0].shape, dtype=bool)
+    for array in arrays:
+        small &= (abs(array) < _LIMIT).astype(bool)
+    
+    if small.all():
+        return function(*(array.astype(np.int64) for array in arrays))
+    
+    results = tuple(np.empty(arrays[0].shape, dtype=object) for _ in range(2))
+    large = ~small
+    for mask, dtype in [(small, np.int64), (large, object)]:
+        if mask.any():
+            for result, part in zip(results, function(*(array[mask].astype(dtype) for array in arrays))):
+                result[mask] = part.astype(object)
+    
+    return results
+
+class RationalArray(object):  # 一组有理数，分子、分母、符号分别保存在 NumPy 数组中，表示方式与 RationalNumber 相同
+    
+    __slots__ = ['numerators', 'denominators', 'signs']
+    
+    __hash__ = None  # 比较运算返回数组，不能作为字典的键
+    
+    def __init__(
+        self,
+        numerators: Iterable[int] = (),
+        denominators: Optional[Iterable[int]] = None,
+        signs: Optional[Iterable[int]] = None
+    ) -> None:
+        numerators = _integers(numerators)
+        denominators = _integers(1 if denominators is None else denominators)
+        signs = _integers(1 if signs is None else signs)
+        numerators, denominators, signs = np.broadcast_arrays(numerators, denominators, signs)
+        
+        if (denominators == 0).any():
+            raise ArithmeticError('The denominator cannot be zero.')
+        if not ((signs == 1) | (signs == -1)).all():
+            raise ArithmeticError('Cannot recognize the sign.')
+        
+        flip = np.where(denominators < 0, -1, 1)  # 分子、分母的符号都并入 sign
+        self._assign(*_compact(*_reduce(numerators * signs * flip, denominators * flip)))
+    
+    def _assign(self, numerators: np.ndarray, denominators: np.ndarray) -> None:  # numerators 带符号，已经约分
+        negative = (numerators < 0).astype(bool)
+        self.numerators = np.where(negative, -numerators, numerators).astype(numerators.dtype)
+        self.denominators = denominators
+        self.signs = np.where(negative, -1, 1).astype(np.int64)  # 0 的符号为 1
+    
+    @classmethod
+    def _from_signed(cls, numerators: np.ndarray, denominators: np.ndarray) -> 'RationalArray':
+        result = object.__new__(cls)
+        result._assign(*_compact(numerators, denominators))
+        
+        return result
+    
+    @classmethod
+    def _from_parts(cls, numerators: np.ndarray, denominators: np.ndarray, signs: np.ndarray) -> 'RationalArray':
+        result = object.__new__(cls)
+        result.numerators = numerators
+        result.denominators = denominators
+        result.signs = signs
+        
+        return result
+    
+    @classmethod
+    def from_rationals(cls, numbers: Sequence[RationalNumber]) -> 'RationalArray':  # 已经约分过，只需拷贝
+        return cls._from_parts(
+            _integers([number.numerator for number in numbers]),
+            _integers([number.denominator for number in numbers]),
+            np.array([number.sign for number in numbers], dtype=np.int64)
+        )
+    
+    def to_rationals(self) -> List[RationalNumber]:
+        return [
+            RationalNumber._from_reduced(sign * numerator, denominator)
+            for numerator, denominator, sign in zip(
+                self.numerators.tolist(), self.denominators.tolist(), self.signs.tolist()
+            )
+        ]
+    
+    def to_floats(self) -> np.ndarray:  # 近似值
+        return (self.signs * self.numerators / self.denominators).astype(np.float64)
+    
+    def _signed(self) -> np.ndarray:
+        return self.signs * self.numerators
+    
+    @staticmethod
+    def _parts(other: Union['RationalArray', RationalNumber, int, Fraction]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if isinstance(other, RationalArray):
+            return other._signed(), other.denominators
+        if isinstance(other, RationalNumber):
+            return _integers(other.sign * other.numerator), _integers(other.denominator)
+        if isinstance(other, (int, Fraction)):
+            return _integers(other.numerator), _integers(other.denominator)
+        
+        return None
+    
+    def _operate(self, function: Callable, other: object, reflected: bool = False) -> 'RationalArray':
+        parts = self._parts(other)
+        if parts is None:
+            return NotImplemented
+        
+        operands = (*parts, self._signed(), self.denominators) if reflected else (self._signed(), self.denominators, *parts)
+        return self._from_signed(*_apply(function, *operands))
+    
+    def __add__(self, other: Union['RationalArray', RationalNumber, int, Fraction]) -> 'RationalArray':
+        return self._operate(_add, other)
+    
+    def __radd__(self, other: Union[RationalNumber, int, Fraction]) -> 'RationalArray':
+        return self._operate(_add, other, True)
+    
+    def __sub__(self, other: Union['RationalArray', RationalNumber, int, Fraction]) -> 'RationalArray':
+        return self._operate(_sub, other)
+    
+    def __rsub__(self, other: Union[RationalNumber, int, Fraction]) -> 'RationalArray':
+        return self._operate(_sub, other, True)
+    
+    def __mul__(self, other: Union['RationalArray', RationalNumber, int, Fraction]) -> 'RationalArray':
+        return self._operate(_mul, other)
+    
+    def __rmul__(self, other: Union[RationalNumber, int, Fraction]) -> 'RationalArray':
+        return self._operate(_mul, other, True)
+    
+    def __truediv__(self, other: Union['RationalArray', RationalNumber, int, Fraction]) -> 'RationalArray':
+        return self._operate(_truediv, other)
+    
+    def __rtruediv__(self, other: Union[RationalNumber, int, Fraction]) -> 'RationalArray':
+        return self._operate(_truediv, other, True)
+    
+    def __neg__(self) -> 'RationalArray':
+        signs = np.where(self.numerators == 0, 1, -self.signs).astype(np.int64)
+        return self._from_parts(self.numerators, self.denominators, signs)
+    
+    def __abs__(self) -> 'RationalArray':
+        return self._from_parts(self.numerators, self.denominators, np.ones_like(self.signs))
+    
+    def _compare(self, other: object) -> Optional[Tuple[np.ndarray, np.ndarray]]:  # 交叉相乘后的两组整数，比较它们等价于比较两组数
+        parts = self._parts(other)
+        if parts is None:
+            return None
+        
+        def cross(
+            first_numerators: np.ndarray,
+            first_denominators: np.ndarray,
+            second_numerators: np.ndarray,
+            second_denominators: np.ndarray
+        ) -> Tuple[np.ndarray, np.ndarray]:
+            return first_numerators * second_denominators, second_numerators * first_denominators
+        
+        return _apply(cross, self._signed(), self.denominators, *parts)
+    
+    def __eq__(self, other: object) -> np.ndarray:
+        result = self._compare(other)
+        return NotImplemented if result is None else (result[0] == result[1]).astype(bool)
+    
+    def __ne__(self, other: object) -> np.ndarray:
+        result = self._compare(other)
+        return NotImplemented if result is None else (result[0] != result[1]).astype(bool)
+    
+    def __lt__(self, other: Union['RationalArray', RationalNumber, int, Fraction]) -> np.ndarray:
+        result = self._compare(other)
+        return NotImplemented if result is None else (result[0] < result[1]).astype(bool)
+    
+    def __le__(self, other: Union['RationalArray', RationalNumber, int, Fraction]) -> np.ndarray:
+        result = self._compare(other)
+        return NotImplemented if result is None else (result[0] <= result[1]).astype(bool)
+    
+    def __gt__(self, other: Union['RationalArray', RationalNumber, int, Fraction]) -> np.ndarray:
+        result = self._compare(other)
+        return NotImplemented if result is None else (result[0] > result[1]).astype(bool)
+    
+    def __ge__(self, other: Union['RationalArray', RationalNumber, int, Fraction]) -> np.ndarray:
+        result = self._compare(other)
+        return NotImplemented if result is None else (result[0] >= result[1]).astype(bool)
+    
+    def _exact(self, index: int) -> Fraction:
+        return Fraction(int(self.signs[index]) * int(self.numerators[index]), int(self.denominators[index]))
+    
+    def argsort(self) -> np.ndarray:  # 先按浮点数近似值排序，再把近似值相近的几段精确地重排
+        if self.numerators.dtype == object:
+            return np.array(sorted(range(len(self)), key=self._exact), dtype=np.intp)
+        
+        approximations = self.to_floats()
+        order = np.argsort(approximations, kind='stable')
+        values = approximations[order]
+        close = np.diff(values) <= 4 * np.spacing(np.abs(values[1:]))  # 相邻两数的误差范围重叠时，顺序可能不对
+        if close.any():
+            edges = np.diff(np.concatenate(([0], close.astype(np.int8), [0])))
+            for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+                order[start:end + 1] = sorted(order[start:end + 1], key=self._exact)
+        
+        return order
+    
+    def sort(self) -> 'RationalArray':  # 返回排好序的新数组
+        return self[self.argsort()]
+    
+    def __len__(self) -> int:
+        return len(self.numerators)
+    
+    def __getitem__(self, index: Union[int, slice, np.ndarray]) -> Union[RationalNumber, 'RationalArray']:
+        if isinstance(index, (int, np.integer)):
+            return RationalNumber._from_reduced(
+                int(self.signs[index]) * int(self.numerators[index]), int(self.denominators[index])
+            )
+        
+        return self._from_parts(self.numerators[index], self.denominators[index], self.signs[index])
+    
+    def __iter__(self) -> Iterator[RationalNumber]:
+        return iter(self.to_rationals())
+    
+    def __str__(self) -> str:
+        return '[' + ', '.join(str(number) for number in self) + ']'
+
+def _products(first: np.ndarray, second: np.ndarray) -> np.ndarray:  # 区间运算中 0 * inf 取 0
+    with np.errstate(invalid='ignore'):
+        products = first * second
+    
+    return np.where((first == 0) | (second == 0), 0.0, products)
+
+def _quotients(first: np.ndarray, second: np.ndarray) -> np.ndarray:  # inf / inf 取绝对值最大的可能
+    with np.errstate(invalid='ignore'):
+        quotients = first / second
+    
+    return np.where(np.isinf(first) & np.isinf(second), np.copysign(np.inf, first) * np.copysign(1.0, second), quotients)
+
+class IntervalArray(object):  # 一组区间，上下界保存在 float64 数组中，规则与 IrrationalNumber 相同，结果向外舍入
+    
+    __slots__ = ['lower_bounds', 'upper_bounds']
+    
+    __hash__ = None
+    
+    def __init__(self, lower_bounds: Iterable[float] = (), upper_bounds: Optional[Iterable[float]] = None) -> None:  # 不给上界时每个区间退化为一个点
+        lower_bounds = np.asarray(lower_bounds, dtype=np.float64)
+        upper_bounds = lower_bounds if upper_bounds is None else np.asarray(upper_bounds, dtype=np.float64)
+        lower_bounds, upper_bounds = np.broadcast_arrays(lower_bounds, upper_bounds)
+        
+        if np.isnan(lower_bounds).any() or np.isnan(upper_bounds).any():
+            raise ArithmeticError('The bounds cannot be nan.')
+        if (lower_bounds > upper_bounds).any():
+            raise ArithmeticError('Lower bound larger than upper bound.')
+        
+        self.lower_bounds = lower_bounds.copy()
+        self.upper_bounds = upper_bounds.copy()
+    
+    @classmethod
+    def _from_bounds(cls, lower_bounds: np.ndarray, upper_bounds: np.ndarray) -> 'IntervalArray':
+        result = object.__new__(cls)
+        result.lower_bounds = lower_bounds
+        result.upper_bounds = upper_bounds
+        
+        return result
+    
+    @classmethod
+    def _outward(cls, lower_bounds: np.ndarray, upper_bounds: np.ndarray) -> 'IntervalArray':
+        return cls._from_bounds(np.nextafter(lower_bounds, -np.inf), np.nextafter(upper_bounds, np.inf))
+    
+    @classmethod
+    def from_intervals(cls, intervals: Sequence[IrrationalNumber]) -> 'IntervalArray':
+        return cls._from_bounds(
+            np.array([interval.lower_bound for interval in intervals], dtype=np.float64),
+            np.array([interval.upper_bound for interval in intervals], dtype=np.float64)
+        )
+    
+    @classmethod
+    def from_rationals(cls, numbers: RationalArray) -> 'IntervalArray':  # 包住每个有理数的区间
+        approximations = numbers.to_floats()
+        lower_bounds = np.nextafter(approximations, -np.inf)
+        upper_bounds = np.nextafter(approximations, np.inf)
+        if numbers.numerators.dtype != object:  # int64 转 float 再相除有三次舍入，误差可能超过一个单位
+            exact = (numbers.numerators <= 1 << 53) & (numbers.denominators <= 1 << 53)
+            for _ in range(2):
+                lower_bounds = np.where(exact, lower_bounds, np.nextafter(lower_bounds, -np.inf))
+                upper_bounds = np.where(exact, upper_bounds, np.nextafter(upper_bounds, np.inf))
+        
+        return cls._from_bounds(lower_bounds, upper_bounds)
+    
+    def to_intervals(self) -> List[IrrationalNumber]:
+        return [
+            IrrationalNumber._from_bounds(lower_bound, upper_bound)
+            for lower_bound, upper_bound in zip(self.lower_bounds.tolist(), self.upper_bounds.tolist())
+        ]
+    
+    @staticmethod
+    def _bounds(other: object) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if isinstance(other, IntervalArray):
+            return other.lower_bounds, other.upper_bounds
+        if isinstance(other, (IrrationalNumber, RationalNumber, Fraction, int, float)):
+            other = IrrationalNumber._coerce(other)
+            return np.float64(other.lower_bound), np.float64(other.upper_bound)
+        
+        return None
+    
+    def __add__(self, other: Union['IntervalArray', IrrationalNumber, RationalNumber, Fraction, int, float]) -> 'IntervalArray':
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        return self._outward(self.lower_bounds + bounds[0], self.upper_bounds + bounds[1])
+    
+    __radd__ = __add__
+    
+    def __neg__(self) -> 'IntervalArray':
+        return self._from_bounds(-self.upper_bounds, -self.lower_bounds)
+    
+    def __sub__(self, other: Union['IntervalArray', IrrationalNumber, RationalNumber, Fraction, int, float]) -> 'IntervalArray':
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        return self._outward(self.lower_bounds - bounds[1], self.upper_bounds - bounds[0])
+    
+    def __rsub__(self, other: Union[IrrationalNumber, RationalNumber, Fraction, int, float]) -> 'IntervalArray':
+        return -self + other
+    
+    def __mul__(self, other: Union['IntervalArray', IrrationalNumber, RationalNumber, Fraction, int, float]) -> 'IntervalArray':
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        products = [
+            _products(self.lower_bounds, bounds[0]), _products(self.lower_bounds, bounds[1]),
+            _products(self.upper_bounds, bounds[0]), _products(self.upper_bounds, bounds[1])
+        ]
+        
+        return self._outward(np.minimum.reduce(products), np.maximum.reduce(products))
+    
+    __rmul__ = __mul__
+    
+    def _divide(self, lower_bounds: np.ndarray, upper_bounds: np.ndarray, divisor: Tuple[np.ndarray, np.ndarray]) -> 'IntervalArray':
+        if ((divisor[0] <= 0) & (divisor[1] >= 0)).any():
+            raise ZeroDivisionError('The divisor interval contains zero.')
+        
+        quotients = [
+            _quotients(lower_bounds, divisor[0]), _quotients(lower_bounds, divisor[1]),
+            _quotients(upper_bounds, divisor[0]), _quotients(upper_bounds, divisor[1])
+        ]
+        
+        return self._outward(np.minimum.reduce(quotients), np.maximum.reduce(quotients))
+    
+    def __truediv__(self, other: Union['IntervalArray', IrrationalNumber, RationalNumber, Fraction, int, float]) -> 'IntervalArray':
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        return self._divide(self.lower_bounds, self.upper_bounds, bounds)
+    
+    def __rtruediv__(self, other: Union[IrrationalNumber, RationalNumber, Fraction, int, float]) -> 'IntervalArray':
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        return self._divide(bounds[0], bounds[1], (self.lower_bounds, self.upper_bounds))
+    
+    @staticmethod
+    def _decide(true: np.ndarray, false: np.ndarray) -> np.ma.MaskedArray:  # 结果不确定的位置被遮盖
+        return np.ma.array(true, mask=~(true | false))
+    
+    def __lt__(self, other: Union['IntervalArray', IrrationalNumber, RationalNumber, Fraction, int, float]) -> np.ma.MaskedArray:
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        return self._decide(self.upper_bounds < bounds[0], self.lower_bounds >= bounds[1])
+    
+    def __le__(self, other: Union['IntervalArray', IrrationalNumber, RationalNumber, Fraction, int, float]) -> np.ma.MaskedArray:
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        return self._decide(self.upper_bounds <= bounds[0], self.lower_bounds > bounds[1])
+    
+    def __gt__(self, other: Union['IntervalArray', IrrationalNumber, RationalNumber, Fraction, int, float]) -> np.ma.MaskedArray:
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        return self._decide(self.lower_bounds > bounds[1], self.upper_bounds <= bounds[0])
+    
+    def __ge__(self, other: Union['IntervalArray', IrrationalNumber, RationalNumber, Fraction, int, float]) -> np.ma.MaskedArray:
+        bounds = self._bounds(other)
+        if bounds is None:
+            return NotImplemented
+        
+        return self._decide(self.lower_bounds >= bounds[1], self.upper_bounds < bounds[0])
+    
+    def __len__(self) -> int:
+        return len(self.lower_bounds)
+    
+    def __getitem__(self, index: Union[int, slice, np.ndarray]) -> Union[IrrationalNumber, 'IntervalArray']:
+        if isinstance(index, (int, np.integer)):
+            return IrrationalNumber._from_bounds(float(self.lower_bounds[index]), float(self.upper_bounds[index]))
+        
+        return self._from_bounds(self.lower_bounds[index], self.upper_bounds[index])
+    
+    def __iter__(self) -> Iterator[IrrationalNumber]:
+        return iter(self.to_intervals())
+    
+    def __str__(self) -> str:
+        return '[' + ', '.join(str(interval) for interval in self) + ']'
+
+RA = RationalArray
+IA = IntervalArray
+
+__all__ = ['IA', 'IntervalArray', 'RA', 'RationalArray']
@@ -0,0 +1,98 @@
+from random import Random
+from unittest import TestCase, main, skipIf
+
+from real_number import IR, RN
+
+try:
+    import numpy
+    from real_array import IA, RA
+except ImportError:  # NumPy 是可选依赖
+    numpy = None
+
+@skipIf(numpy is None, 'NumPy is not installed.')
+class RationalArrayTest(TestCase):
+    
+    def setUp(self) -> None:
+        generator = Random(0)
+        self.first = [RN(generator.randint(0, 1000), generator.randint(1, 1000), generator.choice([1, -1])) for _ in range(200)]
+        self.second = [RN(generator.randint(1, 1000), generator.randint(1, 1000), generator.choice([1, -1])) for _ in range(200)]
+    
+    def test_construct(self) -> None:
+        array = RA([100, 0, 3], [10, 5, -6], [-1, -1, 1])
+        self.assertEqual(array.numerators.tolist(), [10, 0, 1])
+        self.assertEqual(array.denominators.tolist(), [1, 1, 2])
+        self.assertEqual(array.signs.tolist(), [-1, 1, -1])
+        self.assertEqual(str(array), '[-10 / 1, 0, -1 / 2]')
+        with self.assertRaises(ArithmeticError):
+            RA([1], [0])
+        
+        array = RA.from_rationals(self.first)
+        self.assertEqual(len(array), len(self.first))
+        self.assertEqual(array.to_rationals(), self.first)
+        self.assertEqual(array[-1], self.first[-1])
+    
+    def test_compute(self) -> None:
+        first = RA.from_rationals(self.first)
+        second = RA.from_rationals(self.second)
+        for operation in [lambda x, y: x + y, lambda x, y: x - y, lambda x, y: x * y, lambda x, y: x / y]:
+            expected = [operation(x, y) for x, y in zip(self.first, self.second)]
+            self.assertEqual(operation(first, second).to_rationals(), expected)
+        
+        self.assertEqual((1 - first).to_rationals(), [1 - x for x in self.first])
+        self.assertEqual((first * RN(2, 3)).to_rationals(), [x * RN(2, 3) for x in self.first])
+        self.assertEqual((-first).to_rationals(), [-x for x in self.first])
+        with self.assertRaises(ZeroDivisionError):
+            second / RA([0])
+    
+    def test_overflow(self) -> None:
+        big = RA([1 << 40, 3], [3, 1 << 40])
+        square = big * big
+        self.assertEqual(square.numerators.dtype, object)
+        self.assertEqual(square[0], RN(1 << 80, 9))
+        self.assertEqual(square[1], RN(9, 1 << 80))
+        self.assertEqual((square / square).numerators.dtype, numpy.int64)  # 结果能放进 int64 时换回 int64
+        self.assertEqual((big + big).to_rationals(), [x + x for x in big.to_rationals()])
+    
+    def test_compare(self) -> None:
+        first = RA.from_rationals(self.first)
+        second = RA.from_rationals(self.second)
+        self.assertEqual((first < second).tolist(), [x < y for x, y in zip(self.first, self.second)])
+        self.assertEqual((first >= 0).tolist(), [x >= 0 for x in self.first])
+        self.assertEqual((first == first).tolist(), [True] * len(self.first))
+        
+        close = RA([10 ** 17 + 1, 10 ** 17, 10 ** 17 + 2, 1], [10 ** 17, 10 ** 17 - 1, 10 ** 17 + 1, 1])  # 转成浮点数后都等于 1
+        self.assertEqual(close.sort().to_rationals(), sorted(close.to_rationals(), key=lambda x: x.to_fraction()))
+        self.assertEqual(first.sort().to_rationals(), sorted(self.first, key=lambda x: x.to_fraction()))
+
+@skipIf(numpy is None, 'NumPy is not installed.')
+class IntervalArrayTest(TestCase):
+    
+    def test_compute(self) -> None:
+        generator = Random(0)
+        first = [IR(*sorted(generator.uniform(-10, 10) for _ in range(2))) for _ in range(100)]
+        second = [IR(*sorted(generator.uniform(0.5, 10) for _ in range(2))) * generator.choice([1, -1]) for _ in range(100)]
+        first_array, second_array = IA.from_intervals(first), IA.from_intervals(second)
+        for operation in [lambda x, y: x + y, lambda x, y: x - y, lambda x, y: x * y, lambda x, y: x / y]:
+            self.assertEqual(operation(first_array, second_array).to_intervals(), [operation(x, y) for x, y in zip(first, second)])
+        
+        self.assertEqual((first_array * 3).to_intervals(), [x * 3 for x in first])
+        self.assertEqual((1 / second_array).to_intervals(), [1 / x for x in second])
+        with self.assertRaises(ZeroDivisionError):
+            first_array / first_array
+    
+    def test_rationals(self) -> None:
+        numbers = RA([1, 10 ** 18 + 1, -2], [3, 10 ** 18, 1])
+        intervals = IA.from_rationals(numbers)
+        for number, interval in zip(numbers, intervals):
+            self.assertIn(number, interval)
+    
+    def test_compare(self) -> None:
+        intervals = IA([0, 2, 0.5], [1, 3, 1.5])
+        result = intervals < 1.25
+        self.assertEqual(result.mask.tolist(), [False, False, True])  # 第三个区间包含 1.25，结果不确定
+        self.assertEqual(result.data[:2].tolist(), [True, False])
+        self.assertEqual((intervals >= IA([0, 1, 2])).mask.tolist(), [False, False, False])
+        self.assertEqual(str(IA([1])), '[1.0 ~ 1.0]')
+
+if __name__ == '__main__':
+    main()
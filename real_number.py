@@ -1,105 +1,203 @@
-from typing import Union
+from fractions import Fraction
+from math import copysign, gcd, inf, isinf, isnan, nextafter
+from sys import float_info, hash_info
+from typing import Callable, Optional, Tuple, Union
 
-class RationalNumber(object):
+def _add(first_numerator: int, first_denominator: int, second_numerator: int, second_denominator: int) -> Tuple[int, int]:
+    common = gcd(first_denominator, second_denominator)
+    if common == 1:  # 分母互素时结果已是最简
+        return (
+            first_numerator * second_denominator + second_numerator * first_denominator,
+            first_denominator * second_denominator
+        )
     
-    __slot__ = ['numerator', 'denominator', 'sign']
+    factor = first_denominator // common  # 只用较小的数求公约数
+    numerator = first_numerator * (second_denominator // common) + second_numerator * factor
+    common = gcd(numerator, common)
+    if common == 1:
+        return numerator, factor * second_denominator
     
-    def __init__(self, numerator: int = 0, denominator: int = 1, sign: int = 1) -> None:
-        self.numerator = numerator
-        self.denominator = denominator
-        self.sign = sign
+    return numerator // common, factor * (second_denominator // common)
 
-        if denominator == 0:
-            raise ArithmeticError('The denominator cannot be zero.')  # 避免在运算时才报错，防患于未然；暂不使用 property 控制值非零
-        if sign not in [1, -1]:
-            raise ArithmeticError(f'Cannot recognize the sign: {sign}.')  # 符号只有 1 代表的正数和 -1 代表的负数
+def _sub(first_numerator: int, first_denominator: int, second_numerator: int, second_denominator: int) -> Tuple[int, int]:
+    return _add(first_numerator, first_denominator, -second_numerator, second_denominator)
+
+def _mul(first_numerator: int, first_denominator: int, second_numerator: int, second_denominator: int) -> Tuple[int, int]:
+    common = gcd(first_numerator, second_denominator)  # 先交叉约分，乘积就不必再约分
+    if common > 1:
+        first_numerator //= common
+        second_denominator //= common
+    common = gcd(second_numerator, first_denominator)
+    if common > 1:
+        second_numerator //= common
+        first_denominator //= common
+    
+    return first_numerator * second_numerator, first_denominator * second_denominator
 
-        gcd = self._gcd(numerator, denominator)  # 化简
-        self.numerator //= gcd
-        self.denominator //= gcd
+def _truediv(first_numerator: int, first_denominator: int, second_numerator: int, second_denominator: int) -> Tuple[int, int]:
+    if second_numerator == 0:
+        raise ZeroDivisionError('Division by zero.')
+    if second_numerator < 0:
+        second_numerator, second_denominator = -second_numerator, -second_denominator  # 保证分母为正
     
-    @staticmethod  # 这样就不需要传 self，且有多个对象时，这个函数只创建一次且不能修改
-    def _gcd(first: int, second: int) -> int:  # 非递归的_gcd
-        if first < second:
-            first, second = second, first  # 必须前大后小
+    return _mul(first_numerator, first_denominator, second_denominator, second_numerator)  # 乘上倒数
+
+def _operators(function: Callable, fallback: Callable) -> Tuple[Callable, Callable]:  # 生成正向和反射运算符，float 参与时按 float 计算；+= 等使用正向运算符，结果是新对象，不会影响哈希值
+    def forward(self: 'RationalNumber', other: Union['RationalNumber', int, Fraction, float]) -> 'RationalNumber':
+        if isinstance(other, RationalNumber):
+            return self._from_reduced(*function(
+                self.sign * self.numerator, self.denominator, other.sign * other.numerator, other.denominator
+            ))
+        if isinstance(other, (int, Fraction)):
+            return self._from_reduced(*function(
+                self.sign * self.numerator, self.denominator, other.numerator, other.denominator
+            ))
+        if isinstance(other, float):
+            return fallback(float(self), other)
         
-        while second != 0:
-            first, second = second, first % second  # 辗转相除
+        return NotImplemented
+    
+    def reverse(self: 'RationalNumber', other: Union[int, Fraction, float]) -> 'RationalNumber':
+        if isinstance(other, (int, Fraction)):
+            return self._from_reduced(*function(
+                other.numerator, other.denominator, self.sign * self.numerator, self.denominator
+            ))
+        if isinstance(other, float):
+            return fallback(other, float(self))
         
-        return first
+        return NotImplemented
+    
+    return forward, reverse
+
+class RationalNumber(object):  # 分子、分母都非负且互素，符号单独保存，0 的符号为 1；可以与 int、float 和 Fraction 混合运算
+    
+    __slots__ = ['numerator', 'denominator', 'sign']
     
-    def __add__(self, other: 'RationalNumber') -> 'RationalNumber':
-        result = self.__class__()  # 初始化一个合理的返回值
+    def __init__(self, numerator: int = 0, denominator: int = 1, sign: int = 1) -> None:
+        if denominator == 0:
+            raise ArithmeticError('The denominator cannot be zero.')  # 避免在运算时才报错，防患于未然；暂不使用 property 控制值非零
+        if sign not in [1, -1]:
+            raise ArithmeticError(f'Cannot recognize the sign: {sign}.')  # 符号只有 1 代表的正数和 -1 代表的负数
         
-        if self.denominator == other.denominator:
-            result.denominator = self.denominator
-            result.numerator = self.sign * self.numerator + other.sign * other.numerator
+        if numerator < 0:
+            numerator, sign = -numerator, -sign  # 分子、分母的符号都并入 sign
+        if denominator < 0:
+            denominator, sign = -denominator, -sign
         
+        common = gcd(numerator, denominator)  # 化简
+        self.numerator = numerator // common
+        self.denominator = denominator // common
+        self.sign = sign if numerator else 1
+    
+    @classmethod
+    def _from_reduced(cls, numerator: int, denominator: int) -> 'RationalNumber':  # numerator 带符号，已经约分过的结果不必再走 __init__
+        result = object.__new__(cls)
+        if numerator < 0:
+            result.numerator = -numerator
+            result.sign = -1
         else:
-            gcd = self._gcd(self.denominator, other.denominator)
-            result.denominator = self.denominator * other.denominator  # 模拟通分
-            result.numerator = (
-                self.sign * self.numerator * other.denominator 
-                + other.sign * other.numerator * self.denominator
-            )  # 模拟通分中的分子交叉相乘
+            result.numerator = numerator
+            result.sign = 1
+        result.denominator = denominator
+        
+        return result
+    
+    @classmethod
+    def from_fraction(cls, value: Union[Fraction, int]) -> 'RationalNumber':
+        return cls._from_reduced(value.numerator, value.denominator)
+    
+    def to_fraction(self) -> Fraction:
+        return Fraction(self.sign * self.numerator, self.denominator)
+    
+    __add__, __radd__ = _operators(_add, float.__add__)
+    __sub__, __rsub__ = _operators(_sub, float.__sub__)
+    __mul__, __rmul__ = _operators(_mul, float.__mul__)
+    __truediv__, __rtruediv__ = _operators(_truediv, float.__truediv__)
+    
+    def __neg__(self) -> 'RationalNumber':
+        return self._from_reduced(-self.sign * self.numerator, self.denominator)
+    
+    def __pos__(self) -> 'RationalNumber':
+        return self._from_reduced(self.sign * self.numerator, self.denominator)
+    
+    def __abs__(self) -> 'RationalNumber':
+        return self._from_reduced(self.numerator, self.denominator)
     
-        if result.numerator < 0:
-            result.sign = -1  # 根据结果定符号
-            result.numerator = abs(result.numerator)  # 求绝对值
+    def __float__(self) -> float:
+        return self.sign * self.numerator / self.denominator  # 整数相除的结果是正确舍入的
+    
+    def __bool__(self) -> bool:
+        return self.numerator != 0
+    
+    def _compare(self, other: Union['RationalNumber', int, float, Fraction]) -> Optional[int]:  # 交叉相乘比较，不创建中间对象；与 nan 比较时返回 None
+        if isinstance(other, RationalNumber):
+            first = self.sign * self.numerator * other.denominator
+            second = other.sign * other.numerator * self.denominator
+        elif isinstance(other, (int, Fraction)):
+            first = self.sign * self.numerator * other.denominator
+            second = other.numerator * self.denominator
+        elif isinstance(other, float):
+            if isnan(other):
+                return None
+            if isinf(other):
+                return -1 if other > 0 else 1
+            numerator, denominator = other.as_integer_ratio()  # float 的值是精确的二进有理数
+            first = self.sign * self.numerator * denominator
+            second = numerator * self.denominator
+        else:
+            return NotImplemented
         
-        gcd = self._gcd(result.denominator, result.numerator)
-        result.denominator //= gcd
-        result.numerator //= gcd
+        return (first > second) - (first < second)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RationalNumber):  # 表示唯一，不需要交叉相乘
+            return self.numerator == other.numerator and self.denominator == other.denominator and self.sign == other.sign
         
-        return result
-
-    def __sub__(self, other: 'RationalNumber') -> 'RationalNumber':
-        return self.__add__(self.__class__(other.numerator, other.denominator, -other.sign))  # 加上相反数
-
-    def __mul__(self, other: 'RationalNumber') -> 'RationalNumber':
-        result = self.__class__()
+        result = self._compare(other)
+        if result is NotImplemented:
+            return result
         
-        result.denominator = self.denominator * other.denominator  # 分母相乘
-        result.numerator = self.numerator * other.numerator  # 分子相乘
-        result.sign = self.sign * other.sign  # 界定符号
+        return result == 0
+    
+    def __hash__(self) -> int:  # 与数值相等的 int、float 和 Fraction 的哈希值一致
+        modulus = hash_info.modulus
+        try:
+            inverse = pow(self.denominator, -1, modulus)
+        except ValueError:
+            result = hash_info.inf  # 分母是模数的倍数时没有逆元
+        else:
+            result = hash(hash(self.numerator) * inverse)
+        result *= self.sign
         
-        gcd = self._gcd(result.denominator, result.numerator)  # 模拟约分
-        result.denominator //= gcd
-        result.numerator //= gcd
-
-        return result
+        return -2 if result == -1 else result
     
-    def __truediv__(self, other: 'RationalNumber') -> 'RationalNumber':
-        return self.__mul__(self.__class__(other.denominator, other.numerator, other.sign))  # 乘上倒数
+    def __lt__(self, other: Union['RationalNumber', int, float, Fraction]) -> bool:
+        result = self._compare(other)
+        if result is NotImplemented:
+            return result
+        
+        return result is not None and result < 0
     
-    def __eq__(self, other: Union['RationalNumber', int, float]) -> bool:
-        if isinstance(other, int):  # 如果是整数
-            return False if self.denominator != 1 else self.sign * self.numerator == other
-        if isinstance(other, float):
-            return self.sign * self.numerator / self.denominator == other  # 此处可能会有一点点精度问题
-
-        return self - other == 0  # 比较相当于两数做差取符号，下同
-
-    def __lt__(self, other: Union['RationalNumber', int, float]) -> bool:
-        if isinstance(other, self.__class__):
-            return self - other < 0
-
-        return self.numerator / self.denominator * self.sign < other
-
-    def __gt__(self, other: Union['RationalNumber', int, float]) -> bool:
-        if isinstance(other, self.__class__):
-            return self - other > 0
-
-        return self.numerator / self.denominator * self.sign > other
+    def __gt__(self, other: Union['RationalNumber', int, float, Fraction]) -> bool:
+        result = self._compare(other)
+        if result is NotImplemented:
+            return result
+        
+        return result is not None and result > 0
     
-    def __ne__(self, other: Union['RationalNumber', int, float]) -> bool:
-        return not self.__eq__(other)  # 不相等相当于不+相等
+    def __le__(self, other: Union['RationalNumber', int, float, Fraction]) -> bool:
+        result = self._compare(other)
+        if result is NotImplemented:
+            return result
+        
+        return result is not None and result <= 0
     
-    def __le__(self, other: Union['RationalNumber', int, float]) -> bool:
-        return self.__lt__(other) or self.__eq__(other)
-
-    def __ge__(self, other: Union['RationalNumber', int, float]) -> bool:
-        return self.__gt__(other) or self.__eq__(other)
+    def __ge__(self, other: Union['RationalNumber', int, float, Fraction]) -> bool:
+        result = self._compare(other)
+        if result is NotImplemented:
+            return result
+        
+        return result is not None and result >= 0
     
     def __str__(self) -> str:
         if self.numerator == 0:
@@ -111,43 +209,211 @@ class RationalNumber(object):
 
         return f'{result}{self.numerator} / {self.denominator}'
 
-class IrrationalNumber(object):
+class Undecided(object):  # 区间重叠时比较结果不确定，用作条件会报错，避免被当成 False 使用
     
-    __slot__ = ['lower_bound', 'upper_bound']
+    __slots__ = ()
     
-    def __init__(self, lower_bound: float = -0.00000000, upper_bound: float = 0.00000000) -> None:  # 所有默认值默认采用小数后八位精度，初始值为0
-        self.lower_bound = lower_bound
-        self.upper_bound = upper_bound
-        
-        if self.lower_bound > self.upper_bound:
-            raise ArithmeticError('Lower bound larger than upper bound.')  # 不正确的上下界会导致不正确的比较运算
+    def __bool__(self) -> bool:
+        raise ArithmeticError('The comparison is undecided, the intervals overlap.')
     
-    def __add__(self, other: 'IrrationalNumber') -> 'IrrationalNumber':
-        return self.__class__(self.lower_bound + other.lower_bound, self.upper_bound + other.upper_bound)
-
-    def __sub__(self, other: 'IrrationalNumber') -> 'IrrationalNumber':
-        return self.__class__(self.lower_bound - other.lower_bound, self.upper_bound - other.upper_bound)
+    def __repr__(self) -> str:
+        return 'UNDECIDED'
 
-    def __mul__(self, other: 'IrrationalNumber') -> 'IrrationalNumber':
-        return self.__class__(self.lower_bound * other.lower_bound, self.upper_bound * other.upper_bound)
+UNDECIDED = Undecided()
 
-    def __truediv__(self, other: 'IrrationalNumber') -> 'IrrationalNumber':
-        return self.__class__(self.lower_bound / other.lower_bound, self.upper_bound / other.upper_bound)
+def _down(value: float) -> float:  # 向外舍入：下界向负无穷方向移动一个单位
+    return nextafter(value, -inf)
 
-    def __eq__(self, other: 'IrrationalNumber') -> bool:  # 由于不可预知的精度问题，以下运算不保证正确
-        return self.lower_bound == other.lower_bound and self.upper_bound == other.upper_bound
+def _up(value: float) -> float:
+    return nextafter(value, inf)
 
-    def __lt__(self, other: Union['IrrationalNumber', int, float]) -> bool:
-        if isinstance(other, self.__class__):
-            return self.lower_bound < other.lower_bound
+def _product(first: float, second: float) -> float:  # 区间运算中 0 * inf 取 0
+    return 0.0 if first == 0 or second == 0 else first * second
 
-        return self.upper_bound < other
+def _quotient(first: float, second: float) -> float:  # inf / inf 取绝对值最大的可能，保证区间仍然包住真实值
+    if isinf(first) and isinf(second):
+        return copysign(inf, first) * copysign(1.0, second)
+    
+    return first / second
 
-    def __gt__(self, other: Union['IrrationalNumber', int, float]) -> bool:
+class IrrationalNumber(object):  # 用浮点数区间 [lower_bound, upper_bound] 包住一个实数，运算结果向外舍入，保证仍然包住真实值
+    
+    __slots__ = ['lower_bound', 'upper_bound']
+    
+    def __init__(self, lower_bound: float = -0.00000000, upper_bound: float = 0.00000000) -> None:  # 所有默认值默认采用小数后八位精度，初始值为0
+        self.lower_bound = float(lower_bound)
+        self.upper_bound = float(upper_bound)
+        
+        if isnan(self.lower_bound) or isnan(self.upper_bound):
+            raise ArithmeticError('The bounds cannot be nan.')
+        if self.lower_bound > self.upper_bound:
+            raise ArithmeticError('Lower bound larger than upper bound.')  # 不正确的上下界会导致不正确的比较运算
+    
+    @classmethod
+    def _from_bounds(cls, lower_bound: float, upper_bound: float) -> 'IrrationalNumber':
+        result = object.__new__(cls)
+        result.lower_bound = lower_bound
+        result.upper_bound = upper_bound
+        
+        return result
+    
+    @classmethod
+    def from_number(cls, value: Union[RationalNumber, Fraction, int, float]) -> 'IrrationalNumber':  # 包住某个精确值的最窄区间
+        if isinstance(value, RationalNumber):
+            value = value.to_fraction()
+        if isinstance(value, float):
+            return cls(value, value)  # 检查 nan
+        
+        try:
+            approximation = float(value)
+        except OverflowError:  # 超出 float 的范围，只能用最大的有限值到无穷表示
+            return cls._from_bounds(float_info.max, inf) if value > 0 else cls._from_bounds(-inf, -float_info.max)
+        if Fraction(approximation) == value:
+            return cls._from_bounds(approximation, approximation)  # 能精确表示时区间退化为一个点
+        
+        return cls._from_bounds(_down(approximation), _up(approximation))
+    
+    @classmethod
+    def _coerce(cls, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> 'IrrationalNumber':
+        if isinstance(other, cls):
+            return other
+        if isinstance(other, (RationalNumber, Fraction, int, float)):
+            return cls.from_number(other)
+        
+        return NotImplemented
+    
+    @property
+    def width(self) -> float:
+        return self.upper_bound - self.lower_bound
+    
+    def __contains__(self, value: Union[RationalNumber, Fraction, int, float]) -> bool:
+        if isinstance(value, RationalNumber):
+            value = value.to_fraction()
+        
+        return self.lower_bound <= value <= self.upper_bound  # float 与 int、Fraction 的比较是精确的
+    
+    def __add__(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> 'IrrationalNumber':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return self._from_bounds(_down(self.lower_bound + other.lower_bound), _up(self.upper_bound + other.upper_bound))
+    
+    __radd__ = __add__
+    
+    def __neg__(self) -> 'IrrationalNumber':
+        return self._from_bounds(-self.upper_bound, -self.lower_bound)  # 取反是精确的
+    
+    def __sub__(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> 'IrrationalNumber':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return self._from_bounds(_down(self.lower_bound - other.upper_bound), _up(self.upper_bound - other.lower_bound))
+    
+    def __rsub__(self, other: Union[RationalNumber, Fraction, int, float]) -> 'IrrationalNumber':
+        return -self + other
+    
+    def __mul__(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> 'IrrationalNumber':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        products = [
+            _product(self.lower_bound, other.lower_bound), _product(self.lower_bound, other.upper_bound),
+            _product(self.upper_bound, other.lower_bound), _product(self.upper_bound, other.upper_bound)
+        ]  # 端点有正有负时，最值可能出现在任意一对端点上
+        
+        return self._from_bounds(_down(min(products)), _up(max(products)))
+    
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> 'IrrationalNumber':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        if other.lower_bound <= 0 <= other.upper_bound:
+            raise ZeroDivisionError('The divisor interval contains zero.')  # 结果不是一个区间
+        
+        quotients = [
+            _quotient(self.lower_bound, other.lower_bound), _quotient(self.lower_bound, other.upper_bound),
+            _quotient(self.upper_bound, other.lower_bound), _quotient(self.upper_bound, other.upper_bound)
+        ]
+        
+        return self._from_bounds(_down(min(quotients)), _up(max(quotients)))
+    
+    def __rtruediv__(self, other: Union[RationalNumber, Fraction, int, float]) -> 'IrrationalNumber':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return other / self
+    
+    def __eq__(self, other: object) -> bool:  # 比较区间本身是否相同，而不是所包住的值
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        
+        return self.lower_bound == other.lower_bound and self.upper_bound == other.upper_bound
+    
+    def __hash__(self) -> int:
+        return hash((self.lower_bound, self.upper_bound))
+    
+    def _bounds(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> Tuple[object, object]:  # 数值直接参与比较，避免转换成 float 时的舍入
         if isinstance(other, self.__class__):
-            return self.upper_bound > other.upper_bound
-
-        return self.lower_bound > other
+            return other.lower_bound, other.upper_bound
+        if isinstance(other, RationalNumber):
+            other = other.to_fraction()
+        if isinstance(other, (Fraction, int, float)):
+            if isinstance(other, float) and isnan(other):
+                raise ArithmeticError('Cannot compare with nan.')
+            return other, other
+        
+        return NotImplemented, NotImplemented
+    
+    def __lt__(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> Union[bool, Undecided]:  # 结果确定时返回 True 或 False，否则返回 UNDECIDED
+        lower, upper = self._bounds(other)
+        if lower is NotImplemented:
+            return lower
+        if self.upper_bound < lower:
+            return True
+        if self.lower_bound >= upper:
+            return False
+        
+        return UNDECIDED
+    
+    def __le__(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> Union[bool, Undecided]:
+        lower, upper = self._bounds(other)
+        if lower is NotImplemented:
+            return lower
+        if self.upper_bound <= lower:
+            return True
+        if self.lower_bound > upper:
+            return False
+        
+        return UNDECIDED
+    
+    def __gt__(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> Union[bool, Undecided]:
+        lower, upper = self._bounds(other)
+        if lower is NotImplemented:
+            return lower
+        if self.lower_bound > upper:
+            return True
+        if self.upper_bound <= lower:
+            return False
+        
+        return UNDECIDED
+    
+    def __ge__(self, other: Union['IrrationalNumber', RationalNumber, Fraction, int, float]) -> Union[bool, Undecided]:
+        lower, upper = self._bounds(other)
+        if lower is NotImplemented:
+            return lower
+        if self.lower_bound >= upper:
+            return True
+        if self.upper_bound < lower:
+            return False
+        
+        return UNDECIDED
 
     def __str__(self) -> str:
         return f'{self.lower_bound} ~ {self.upper_bound}'
@@ -155,4 +421,4 @@ class IrrationalNumber(object):
 RN = RationalNumber
 IR = IrrationalNumber
 
-__all__ = ['RN', 'RationalNumber', 'IR', 'IrrationalNumber']
+__all__ = ['RN', 'RationalNumber', 'IR', 'IrrationalNumber', 'UNDECIDED']
@@ -1,8 +1,10 @@
 from fractions import Fraction
-from random import randint
+from math import inf
+from random import Random, randint
+from sys import float_info
 from unittest import TestCase, main
 
-from real_number import RN
+from real_number import IR, RN, UNDECIDED
 
 class RationalNumberTest(TestCase):
     
@@ -52,6 +54,105 @@ class RationalNumberTest(TestCase):
         self.assertTrue(RN(111, 100) >= RN(11000, 10000))
         self.assertTrue(RN(111, 100, -1) < RN(11000, 10000, -1))
         self.assertTrue(RN(111, 100, -1) <= RN(11000, 10000, -1))
+        
+        self.assertTrue(RN(10 ** 30 + 1, 10 ** 30) > 1)  # 转成 float 会丢失精度
+        self.assertFalse(RN(10 ** 30 + 1, 10 ** 30) == 1.0)
+        self.assertTrue(RN(1, 10) != 0.1)
+        self.assertTrue(RN(3, 4) == 0.75 and RN(3, 4, -1) >= Fraction(-3, 4))
+        self.assertTrue(RN(1, 3) < float('inf') and RN(1, 3) > float('-inf'))
+        self.assertFalse(RN(1, 3) < float('nan') or RN(1, 3) >= float('nan'))
+    
+    def test_hash(self) -> None:
+        for value in [Fraction(0), Fraction(-3), Fraction(5, 7), Fraction(-1, 2), Fraction(10 ** 40, 3)]:
+            number = RN.from_fraction(value)
+            self.assertEqual(hash(number), hash(value))
+            self.assertEqual(number.to_fraction(), value)
+        self.assertEqual(len({RN(1, 2), RN(2, 4), 0.5, Fraction(1, 2)}), 1)
+        self.assertFalse(hasattr(RN(), '__dict__'))
+    
+    def test_mixed(self) -> None:
+        half = RN(1, 2)
+        self.assertTrue(half + 1 == RN(3, 2) and 1 - half == half)
+        self.assertTrue(Fraction(1, 3) * half == RN(1, 6))
+        self.assertTrue(1 / half == 2 and half / Fraction(-1, 4) == -2)
+        self.assertIsInstance(half + 0.25, float)
+        self.assertEqual(float(RN(1, 3, -1)), -1 / 3)
+        self.assertEqual(RN(-2, -4), half)
+        self.assertEqual((-half).sign, -1)
+        self.assertEqual((half - half).sign, 1)
+        with self.assertRaises(ZeroDivisionError):
+            half / RN()
+    
+    def test_inplace(self) -> None:
+        number = RN(1, 2)
+        alias = number
+        number += RN(1, 3)
+        number *= 6
+        self.assertIsNot(number, alias)  # 数可以作为集合元素，不能原地修改
+        self.assertEqual(number, 5)
+        self.assertEqual(alias, RN(1, 2))
+        self.assertIn(alias, {RN(1, 2)})
+        number -= Fraction(11, 2)
+        self.assertEqual(str(number), '-1 / 2')
+        number /= RN(1, 2, -1)
+        self.assertEqual(number, 1)
+        number += 0.5
+        self.assertIsInstance(number, float)
+
+class IrrationalNumberTest(TestCase):
+    
+    def test_construct(self) -> None:
+        with self.assertRaises(ArithmeticError):
+            IR(1, 0)
+        with self.assertRaises(ArithmeticError):
+            IR(float('nan'), 0)
+        
+        third = IR.from_number(RN(1, 3))
+        self.assertLess(third.lower_bound, 1 / 3 + 1e-16)
+        self.assertIn(Fraction(1, 3), third)
+        self.assertNotIn(Fraction(1, 3), IR(1 / 3, 1 / 3))  # 1/3 不能用 float 精确表示
+        self.assertEqual(IR.from_number(0.5), IR(0.5, 0.5))
+        
+        huge = IR.from_number(RN(10 ** 400))  # 超出 float 的范围
+        self.assertEqual((huge.lower_bound, huge.upper_bound), (float_info.max, inf))
+        self.assertIn(10 ** 400, huge)
+        self.assertIn(-Fraction(10 ** 400, 3), IR.from_number(Fraction(-10 ** 400, 3)))
+        self.assertIn(10 ** 400 + 1, IR(0, 1) + 10 ** 400)
+        self.assertIs(IR(0, 1) < -10 ** 400, False)
+    
+    def test_compute(self) -> None:
+        generator = Random(0)
+        operations = [lambda x, y: x + y, lambda x, y: x - y, lambda x, y: x * y, lambda x, y: x / y]
+        for _ in range(200):
+            bounds = sorted(generator.uniform(-10, 10) for _ in range(2)), sorted(generator.uniform(-10, 10) for _ in range(2))
+            if bounds[1][0] <= 0 <= bounds[1][1]:
+                bounds[1][0] = bounds[1][1] = 0.5
+            first, second = IR(*bounds[0]), IR(*bounds[1])
+            for _ in range(5):  # 区间中任取两个值，精确计算的结果必须落在结果区间中
+                x = Fraction(generator.uniform(*bounds[0]))
+                y = Fraction(generator.uniform(*bounds[1]))
+                for operation in operations:
+                    self.assertIn(operation(x, y), operation(first, second))
+        
+        self.assertEqual(IR(1, 2) - IR(1, 2), IR(-1.0000000000000002, 1.0000000000000002))  # 即使结果精确也向外舍入
+        self.assertIn(Fraction(-6), IR(-2, 3) * IR(-2, 3))
+        self.assertIn(Fraction(1, 10), IR.from_number(RN(1, 10)) * 1)
+        with self.assertRaises(ZeroDivisionError):
+            IR(1, 2) / IR(-1, 1)
+        with self.assertRaises(ZeroDivisionError):
+            1 / IR(0, 1)
+    
+    def test_compare(self) -> None:
+        self.assertIs(IR(0, 1) < IR(2, 3), True)
+        self.assertIs(IR(0, 1) > IR(2, 3), False)
+        self.assertIs(IR(0, 2) < IR(1, 3), UNDECIDED)
+        self.assertIs(IR(0, 1) <= 1, True)
+        self.assertIs(IR(0, 1) < 1, UNDECIDED)
+        self.assertIs(IR(1, 1) >= RN(1, 1), True)
+        self.assertIs(IR.from_number(RN(1, 3)) > RN(1, 3), UNDECIDED)
+        with self.assertRaises(ArithmeticError):
+            if IR(0, 2) < IR(1, 3):
+                pass
 
 if __name__ == '__main__':
     main()
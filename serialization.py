@@ -0,0 +1,156 @@
+from mmap import ACCESS_READ, mmap
+from struct import Struct, error as StructError, pack, unpack_from
+from typing import Iterator, List, Optional, Sequence, Union
+
+from surreal_number import BasicSurrealNumber, SurrealNumber, encode_forms
+
+# 文件格式（小端序）：
+#   文件头    magic, version, 节点数, 根节点数
+#   偏移表    (节点数 + 1) 个 u64，第 i 个节点的记录在记录区中的起始位置
+#   根节点    根节点数个 u32
+#   记录区    每个节点依次为 左选项数 u32, 右选项数 u32, 各选项的节点编号 u32
+# 每个不同的节点只写一次，子节点的编号总是小于父节点
+
+MAGIC = b'SRNM'
+VERSION = 1
+
+_HEADER = Struct('<4sIQQ')
+_OFFSET = Struct('<Q')
+_COUNTS = Struct('<II')
+
+def _chunks(forms: Sequence[BasicSurrealNumber]) -> Iterator[bytes]:
+    records, roots = encode_forms(forms)
+    
+    offsets = [0]
+    for left, right in records:
+        offsets.append(offsets[-1] + _COUNTS.size + 4 * (len(left) + len(right)))
+    
+    yield _HEADER.pack(MAGIC, VERSION, len(records), len(roots))
+    yield pack(f'<{len(offsets)}Q', *offsets)
+    yield pack(f'<{len(roots)}I', *roots)
+    for left, right in records:
+        yield _COUNTS.pack(len(left), len(right))
+        yield pack(f'<{len(left) + len(right)}I', *left, *right)
+
+def dump(forms: Sequence[BasicSurrealNumber], path: str) -> None:
+    with open(path, 'wb') as file:
+        file.writelines(_chunks(forms))
+
+def dumps(forms: Sequence[BasicSurrealNumber]) -> bytes:
+    return b''.join(_chunks(forms))
+
+class MappedForms(object):  # 在内存映射的文件或任意字节串上按需构造数，访问到哪个数才构造哪些节点
+    
+    __slots__ = ['cls', 'node_count', 'root_count', '_file', '_map', '_roots', '_records', '_nodes']
+    
+    def __init__(self, buffer: Union[bytes, mmap], cls: type = SurrealNumber, file: Optional[object] = None) -> None:
+        self.cls = cls
+        self._file = file  # 关闭时一并关闭
+        self._map = buffer
+        
+        if len(buffer) < _HEADER.size:
+            self.close()
+            raise ValueError('Not a surreal number file.')
+        magic, version, self.node_count, self.root_count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('Not a surreal number file.')
+        
+        self._roots = _HEADER.size + _OFFSET.size * (self.node_count + 1)
+        self._records = self._roots + 4 * self.root_count
+        if self._records > len(buffer) or self._records + self._offset(self.node_count) != len(buffer):
+            self.close()
+            raise ValueError('Truncated surreal number file.')
+        
+        self._nodes = {}  # 已经构造的节点
+    
+    def _offset(self, node_id: int) -> int:
+        return _OFFSET.unpack_from(self._map, _HEADER.size + _OFFSET.size * node_id)[0]
+    
+    def _read(self, node_id: int) -> Sequence[int]:  # 返回 (左选项数, 各选项编号...)
+        if not 0 <= node_id < self.node_count:
+            raise IndexError(f'Node {node_id} out of range.')
+        
+        try:
+            position = self._records + self._offset(node_id)
+            left_count, right_count = _COUNTS.unpack_from(self._map, position)
+            members = unpack_from(f'<{left_count + right_count}I', self._map, position + _COUNTS.size)
+        except StructError:
+            raise ValueError(f'Corrupted record for node {node_id}: offset out of range.')  # 偏移表被损坏
+        if any(member >= node_id for member in members):
+            raise ValueError(f'Corrupted record for node {node_id}.')  # 子节点编号必须更小，保证没有环
+        
+        return (left_count,) + members
+    
+    def node(self, node_id: int) -> BasicSurrealNumber:
+        nodes = self._nodes
+        if node_id in nodes:
+            return nodes[node_id]
+        
+        stack = [node_id]  # 用栈代替递归，先构造子节点
+        while stack:
+            current = stack[-1]
+            if current in nodes:
+                stack.pop()
+                continue
+            
+            record = self._read(current)
+            pending = [member for member in record[1:] if member not in nodes]
+            if pending:
+                stack.extend(pending)
+                continue
+            
+            stack.pop()
+            left_count = record[0]
+            try:  # 文件可能被损坏，仍需检查合法性；比较结果有缓存，开销不大
+                nodes[current] = self.cls(
+                    frozenset(nodes[member] for member in record[1:left_count + 1]),
+                    frozenset(nodes[member] for member in record[left_count + 1:])
+                )
+            except ArithmeticError:
+                raise ValueError(f'Corrupted record for node {current}: not a valid surreal number.')
+        
+        return nodes[node_id]
+    
+    def __getitem__(self, index: int) -> BasicSurrealNumber:
+        if index < 0:
+            index += self.root_count
+        if not 0 <= index < self.root_count:
+            raise IndexError(f'Form {index} out of range.')
+        
+        return self.node(unpack_from('<I', self._map, self._roots + 4 * index)[0])
+    
+    def __len__(self) -> int:
+        return self.root_count
+    
+    def __iter__(self) -> Iterator[BasicSurrealNumber]:
+        for index in range(self.root_count):
+            yield self[index]
+    
+    def close(self) -> None:  # 已经构造的数不受影响
+        if isinstance(self._map, mmap):
+            self._map.close()
+        self._map = None
+        if self._file is not None:
+            self._file.close()
+    
+    def __enter__(self) -> 'MappedForms':
+        return self
+    
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+def load(path: str, cls: type = SurrealNumber) -> MappedForms:
+    file = open(path, 'rb')
+    try:
+        buffer = mmap(file.fileno(), 0, access=ACCESS_READ)
+    except ValueError:
+        file.close()
+        raise ValueError(f'Not a surreal number file: {path}.')  # 空文件无法映射
+    
+    return MappedForms(buffer, cls, file)
+
+def loads(data: bytes, cls: type = SurrealNumber) -> List[BasicSurrealNumber]:
+    return list(MappedForms(data, cls))
+
+__all__ = ['dump', 'dumps', 'load', 'loads', 'MappedForms']
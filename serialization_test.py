@@ -0,0 +1,91 @@
+from os import remove
+from struct import pack
+from tempfile import mkstemp
+from unittest import TestCase, main
+
+from serialization import MAGIC, VERSION, _HEADER, dump, dumps, load, loads
+from surreal_number import BSN, SN, compare, surreal_numbers
+
+class SerializationTest(TestCase):
+    
+    def setUp(self) -> None:
+        _, self.path = mkstemp(suffix='.srn')
+    
+    def tearDown(self) -> None:
+        remove(self.path)
+    
+    def test_round_trip(self) -> None:
+        numbers = list(surreal_numbers(last_day=4))
+        products = [numbers[3] * numbers[20], numbers[7] + numbers[9] - numbers[30]]
+        dump(numbers + products, self.path)
+        
+        with load(self.path) as forms:
+            self.assertEqual(len(forms), len(numbers) + len(products))
+            for original, loaded in zip(numbers + products, forms):
+                self.assertIs(loaded, original)  # 结构相同的数是同一个对象
+            self.assertIs(forms[-1], products[-1])
+            with self.assertRaises(IndexError):
+                forms[len(forms)]
+    
+    def test_shared_nodes(self) -> None:
+        zero = BSN()
+        deep = zero
+        for _ in range(3000):  # 共享子节点只写一次，也不会超出递归深度
+            deep = BSN(left={deep})
+        dump([deep, zero], self.path)
+        
+        with open(self.path, 'rb') as file:
+            self.assertLess(len(file.read()), 20 * 3001 + 100)
+        
+        with load(self.path, BSN) as forms:
+            self.assertEqual(forms.node_count, 3001)
+            self.assertIs(forms[1], zero)
+            self.assertEqual(len(forms._nodes), 1)  # 只构造了访问到的节点
+            self.assertIs(forms[0], deep)
+            self.assertEqual(len(forms._nodes), 3001)
+        
+        with load(self.path) as forms:  # 换一种类型读取
+            self.assertIs(forms[1], SN())
+            self.assertIsInstance(forms[0], SN)
+            self.assertEqual(compare(forms[0], forms[1]), 1)
+    
+    def test_bytes(self) -> None:
+        numbers = list(surreal_numbers(last_day=3))
+        data = dumps(numbers)
+        
+        self.assertEqual(loads(data), numbers)
+        with self.assertRaises(ValueError):
+            loads(data[:len(data) // 2])
+    
+    def test_invalid_file(self) -> None:
+        with open(self.path, 'wb') as file:
+            file.write(b'not a surreal number file')
+        with self.assertRaises(ValueError):
+            load(self.path)
+        
+        dump([SN(left={SN()})], self.path)
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        with open(self.path, 'wb') as file:
+            file.write(data[:-4])  # 截断的文件
+        with self.assertRaises(ValueError):
+            load(self.path)
+    
+    def test_invalid_form(self) -> None:
+        records = [((), ()), ((0,), ()), ((1,), (0,))]  # 第三个节点是 {1|0}，违反第一条规则
+        offsets = [0]
+        for left, right in records:
+            offsets.append(offsets[-1] + 8 + 4 * (len(left) + len(right)))
+        body = b''.join(pack(f'<II{len(left) + len(right)}I', len(left), len(right), *left, *right) for left, right in records)
+        
+        with self.assertRaises(ValueError):
+            loads(_HEADER.pack(MAGIC, VERSION, 3, 1) + pack('<4Q', *offsets) + pack('<I', 2) + body)
+        with self.assertRaises(ArithmeticError):
+            SN(left={SN(left={SN()})}, right={SN()})  # 损坏的文件不会留下不合法的数
+        
+        offsets[1] = 1 << 32  # 偏移超出文件范围
+        with self.assertRaises(ValueError):
+            loads(_HEADER.pack(MAGIC, VERSION, 3, 1) + pack('<4Q', *offsets) + pack('<I', 1) + body)
+
+if __name__ == '__main__':
+    main()
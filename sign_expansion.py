@@ -0,0 +1,220 @@
+from fractions import Fraction
+from typing import Iterator, Union
+
+from dyadic_number import DyadicNumber
+from real_number import RationalNumber
+from surreal_number import BasicSurrealNumber, SurrealNumber, from_value, order_key
+
+class SignExpansion(object):  # 数的符号展开，即从 0 出发的诞生路径，按字典序比较即为大小关系（- < 结束 < +）
+    
+    __slots__ = ['bits', 'length']
+    
+    def __init__(self, signs: str = '') -> None:  # signs 由 '+' 和 '-' 组成
+        bits = 0
+        for sign in signs:
+            if sign not in '+-':
+                raise ValueError(f'Invalid sign: {sign!r}.')
+            bits = bits << 1 | (sign == '+')
+        
+        self.bits = bits  # 第一个符号在最高位，1 表示 +
+        self.length = len(signs)
+    
+    @classmethod
+    def _from_bits(cls, bits: int, length: int) -> 'SignExpansion':
+        result = object.__new__(cls)
+        result.bits = bits
+        result.length = length
+        
+        return result
+    
+    @classmethod
+    def from_fraction(cls, value: Fraction) -> 'SignExpansion':
+        denominator = value.denominator
+        if denominator & (denominator - 1):
+            raise ArithmeticError(f'Not a dyadic rational: {value}.')  # 只有二进有理数的符号展开是有限的
+        if value == 0:
+            return cls._from_bits(0, 0)
+        
+        magnitude = abs(value)
+        integer = magnitude.numerator // denominator
+        if denominator == 1:  # 正整数 n 是 n 个 +
+            bits, length = (1 << integer) - 1, integer
+        else:  # 整数部分 m 之后是 +...+-，再接小数部分除最后一位外的二进制位
+            exponent = denominator.bit_length() - 1
+            fraction = magnitude.numerator - integer * denominator
+            bits = ((1 << (integer + 1)) - 1) << 1
+            bits = bits << (exponent - 1) | fraction >> 1
+            length = integer + 2 + exponent - 1
+        
+        if value < 0:
+            bits ^= (1 << length) - 1  # 负数的符号全部取反
+        
+        return cls._from_bits(bits, length)
+    
+    @classmethod
+    def from_dyadic(cls, number: DyadicNumber) -> 'SignExpansion':
+        return cls.from_fraction(number.to_fraction())
+    
+    @classmethod
+    def from_surreal(cls, number: BasicSurrealNumber) -> 'SignExpansion':
+        return cls.from_fraction(order_key(number))
+    
+    def to_fraction(self) -> Fraction:
+        if not self.length:
+            return Fraction(0)
+        
+        first = self.bits >> (self.length - 1)
+        complement = (1 << self.length) - 1
+        bits = self.bits if first else self.bits ^ complement  # 先按正数处理
+        run = self.length - (~bits & complement).bit_length()  # 开头连续的 + 的个数
+        if run == self.length:
+            result = Fraction(run)
+        else:  # 之后的每一步是 1/2, 1/4, ... ，+ 为加，- 为减
+            steps = self.length - run
+            tail = bits & ((1 << steps) - 1)
+            result = Fraction(((run - 1) << steps) + 2 * tail + 1, 1 << steps)
+        
+        return result if first else -result
+    
+    def to_dyadic(self) -> DyadicNumber:
+        return DyadicNumber.from_fraction(self.to_fraction())
+    
+    def to_surreal(self, cls: type = SurrealNumber) -> BasicSurrealNumber:  # 得到最简单的形式
+        return from_value(self.to_fraction(), cls)
+    
+    @property
+    def day(self) -> int:  # 诞生的天数等于展开的长度
+        return self.length
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def __iter__(self) -> Iterator[int]:  # 依次给出每个符号，+1 或 -1
+        for position in range(self.length - 1, -1, -1):
+            yield 1 if self.bits >> position & 1 else -1
+    
+    @classmethod
+    def _coerce(
+        cls,
+        other: Union['SignExpansion', int, Fraction, RationalNumber, DyadicNumber, BasicSurrealNumber],
+        forms: bool = True
+    ) -> 'SignExpansion':  # forms 为 False 时不接受形式，规则与 DyadicNumber 相同
+        if isinstance(other, cls):
+            return other
+        if isinstance(other, int):
+            return cls.from_fraction(Fraction(other))
+        if isinstance(other, Fraction):
+            return cls.from_fraction(other)
+        if isinstance(other, RationalNumber):
+            return cls.from_fraction(other.to_fraction())
+        if isinstance(other, DyadicNumber):
+            return cls.from_dyadic(other)
+        if forms and isinstance(other, BasicSurrealNumber):
+            return cls.from_surreal(other)
+        
+        return NotImplemented
+    
+    def _compare(self, other: 'SignExpansion') -> int:  # 比较公共长度的前缀，相同时看较长者的下一个符号
+        common = min(self.length, other.length)
+        first = self.bits >> (self.length - common)
+        second = other.bits >> (other.length - common)
+        if first != second:
+            return 1 if first > second else -1  # 等长的位串按字典序比较就是按整数比较
+        if self.length > common:
+            return 1 if self.bits >> (self.length - common - 1) & 1 else -1
+        if other.length > common:
+            return -1 if other.bits >> (other.length - common - 1) & 1 else 1
+        
+        return 0
+    
+    def _order(self, other: Union['SignExpansion', int, Fraction, RationalNumber, DyadicNumber]) -> int:  # Fraction 和 RationalNumber 不一定是二进有理数，按分数比较
+        if isinstance(other, RationalNumber):
+            other = other.to_fraction()
+        if isinstance(other, Fraction):
+            value = self.to_fraction()
+            return (value > other) - (value < other)
+        
+        other = self._coerce(other, forms=False)
+        if other is NotImplemented:
+            return other
+        
+        return self._compare(other)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SignExpansion):
+            return self.length == other.length and self.bits == other.bits  # 表示唯一
+        
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result == 0
+    
+    def __hash__(self) -> int:  # 与数值相等的 int、Fraction 和二进有理数的哈希值一致
+        return hash(self.to_fraction())
+    
+    def __lt__(self, other: Union['SignExpansion', int, Fraction, RationalNumber, DyadicNumber]) -> bool:
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result < 0
+    
+    def __le__(self, other: Union['SignExpansion', int, Fraction, RationalNumber, DyadicNumber]) -> bool:
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result <= 0
+    
+    def __gt__(self, other: Union['SignExpansion', int, Fraction, RationalNumber, DyadicNumber]) -> bool:
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result > 0
+    
+    def __ge__(self, other: Union['SignExpansion', int, Fraction, RationalNumber, DyadicNumber]) -> bool:
+        result = self._order(other)
+        if result is NotImplemented:
+            return result
+        
+        return result >= 0
+    
+    def __neg__(self) -> 'SignExpansion':  # 取反只需翻转所有符号
+        return self._from_bits(self.bits ^ ((1 << self.length) - 1), self.length)
+    
+    def __add__(self, other: Union['SignExpansion', int, DyadicNumber]) -> 'SignExpansion':  # 其余运算借助二进有理数完成
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return self.from_dyadic(self.to_dyadic() + other.to_dyadic())
+    
+    __radd__ = __add__
+    
+    def __sub__(self, other: Union['SignExpansion', int, DyadicNumber]) -> 'SignExpansion':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return self + (-other)
+    
+    def __rsub__(self, other: Union['SignExpansion', int, DyadicNumber]) -> 'SignExpansion':
+        return -self + other
+    
+    def __mul__(self, other: Union['SignExpansion', int, DyadicNumber]) -> 'SignExpansion':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        
+        return self.from_dyadic(self.to_dyadic() * other.to_dyadic())
+    
+    __rmul__ = __mul__
+    
+    def __str__(self) -> str:
+        return ''.join('+' if sign > 0 else '-' for sign in self) or '0'
+
+SE = SignExpansion
+
+__all__ = ['SE', 'SignExpansion']
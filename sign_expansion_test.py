@@ -0,0 +1,68 @@
+from fractions import Fraction
+from unittest import TestCase, main
+
+from dyadic_number import DN
+from real_number import RN
+from sign_expansion import SE
+from surreal_number import SN, compare, simplest_form, surreal_numbers
+
+class SignExpansionTest(TestCase):
+    
+    def test_construct(self) -> None:
+        self.assertEqual(SE('+-+').to_fraction(), Fraction(3, 4))
+        self.assertEqual(SE('--+').to_fraction(), Fraction(-3, 2))
+        self.assertEqual(SE('+++').to_fraction(), 3)
+        self.assertEqual(SE().to_fraction(), 0)
+        self.assertEqual(str(SE.from_fraction(Fraction(-5, 8))), '-+-+')
+        self.assertEqual(str(SE()), '0')
+        self.assertEqual(list(SE('+-')), [1, -1])
+        with self.assertRaises(ValueError):
+            SE('+0')
+        with self.assertRaises(ArithmeticError):
+            SE.from_fraction(Fraction(1, 3))
+    
+    def test_convert(self) -> None:
+        numbers = list(surreal_numbers(last_day=5))
+        for number in numbers:
+            expansion = SE.from_surreal(number)
+            self.assertEqual(expansion.day, SE.from_dyadic(DN.from_surreal(number)).day)
+            self.assertIs(expansion.to_surreal(), simplest_form(number))
+            self.assertEqual(SE.from_fraction(expansion.to_fraction()), expansion)
+        
+        self.assertEqual([SE.from_surreal(number).day for number in numbers[:4]], [0, 1, 1, 2])
+        self.assertEqual(SE.from_surreal(numbers[0] * numbers[0] + numbers[2]), SE.from_surreal(numbers[2]))
+    
+    def test_compare(self) -> None:
+        numbers = list(surreal_numbers(last_day=5))
+        expansions = [SE.from_surreal(number) for number in numbers]
+        for x, ex in zip(numbers[::3], expansions[::3]):
+            for y, ey in zip(numbers[::2], expansions[::2]):
+                self.assertEqual(ex._compare(ey), compare(x, y))
+        
+        self.assertEqual(sorted(expansions), [SE.from_fraction(value) for value in sorted(e.to_fraction() for e in expansions)])
+        self.assertEqual(len(set(expansions + expansions)), len(expansions))
+        self.assertEqual(len({SE('+'), 1, DN(1)}), 1)
+        self.assertEqual(len({SE('-+-'), DN(-3, 2), Fraction(-3, 4), RN(3, 4, -1), SE('--+')}), 2)
+        self.assertEqual(SE('+-'), Fraction(1, 2))
+        self.assertEqual(Fraction(1, 2), SE('+-'))
+        self.assertNotEqual(SE('+-'), Fraction(1, 3))
+        self.assertTrue(SE('+-') > Fraction(1, 3))
+        self.assertTrue(RN(2, 3) > SE('+-'))
+        
+        zero = SN()
+        self.assertNotEqual(SE(), zero)  # 形式按结构比较，与数值不混用，== 与比较大小的结果一致
+        with self.assertRaises(TypeError):
+            SE() <= zero
+        self.assertTrue(SE('+-') < 1)
+        self.assertTrue(SE('+-') > DN(1, 2) - 1)
+    
+    def test_arithmetic(self) -> None:
+        half = SE('+-')
+        self.assertEqual(half + half, SE('+'))
+        self.assertEqual(half * half, SE('+--'))
+        self.assertEqual(1 - half, half)
+        self.assertEqual(-SE('+-+'), SE('-+-'))
+        self.assertEqual(half + SN(left={SN()}), SE('++-'))
+
+if __name__ == '__main__':
+    main()
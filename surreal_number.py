@@ -1,73 +1,655 @@
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from fractions import Fraction
 from itertools import product
-from typing import Set, Union
+from math import floor
+from os import cpu_count
+from time import perf_counter
+from typing import Callable, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from weakref import WeakValueDictionary
 
-class BasicSurrealNumber(object):
+_interned = WeakValueDictionary()  # 结构相同的数只保留一个实例（hash consing），不再被引用时自动回收
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+class LRUCache(object):
+    
+    __slots__ = ['maxsize', 'hits', 'misses', '_data']
+    
+    def __init__(self, maxsize: int = 1 << 16) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+    
+    def get(self, key: Hashable, default: object = None) -> object:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        
+        self._data.move_to_end(key)  # 最近使用过的放在末尾，淘汰时从头部开始
+        self.hits += 1
+        return value
+    
+    def put(self, key: Hashable, value: object) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+compare_cache = LRUCache()  # 比较结果的缓存，键是 (x, y)，值是 x <= y
+
+_operation_cache = LRUCache()  # 加法、取反、乘法结果的缓存，可以替换为任何实现了 get 和 put 的对象
+
+def get_operation_cache() -> Optional[LRUCache]:
+    return _operation_cache
+
+@contextmanager
+def use_operation_cache(cache: Optional[LRUCache]) -> Iterator[Optional[LRUCache]]:  # 传入 None 则在 with 块内关闭缓存
+    global _operation_cache
+    previous = _operation_cache
+    _operation_cache = cache
+    try:
+        yield cache
+    finally:
+        _operation_cache = previous
+
+_canonical_mode = (True, False)  # (是否剪枝, 是否化为最简形式)
+
+@contextmanager
+def canonical_forms(prune: bool = True, simplify: bool = False) -> Iterator[None]:  # 控制加法和乘法结果的规范化方式
+    global _canonical_mode
+    previous = _canonical_mode
+    _canonical_mode = (prune or simplify, simplify)
+    try:
+        yield
+    finally:
+        _canonical_mode = previous
+
+def get_canonical_mode() -> Tuple[bool, bool]:  # 当前的 (是否剪枝, 是否化为最简形式)，结果依赖规范化方式的缓存可以用它作为键的一部分
+    return _canonical_mode
+
+def _operation_key(operator: str, x: 'BasicSurrealNumber', y: Optional['BasicSurrealNumber']) -> Tuple:
+    if y is None:
+        return operator, x  # 取反只有一个操作数，结果也与规范化方式无关
+    if id(x) > id(y):
+        x, y = y, x  # 加法和乘法满足交换律，统一操作数顺序
+    
+    return operator, _canonical_mode, x, y  # 不同规范化方式下的结果不能混用
+
+_NAMES = {'<=': '__le__', '+': '__add__', '-': '__neg__', '*': '__mul__'}
+
+class OperationStats(object):  # 统计各个热点函数的调用次数和耗时（含子调用），由 instrument 返回
     
-    __slot__ = ['left', 'right']
+    __slots__ = ['calls', 'hits', 'seconds', 'max_depth', 'option_sizes', '_depth']
     
-    def __init__(self, left: Set['BasicSurrealNumber'] = None, right: Set['BasicSurrealNumber'] = None) -> None:
-        if left is None:
-            left = set()
-        if right is None:
-            right = set()
+    def __init__(self) -> None:
+        self.calls = Counter()  # 含命中缓存的调用
+        self.hits = Counter()  # 命中缓存、不必计算的调用
+        self.seconds = defaultdict(float)
+        self.max_depth = 0  # 运算嵌套的最大深度，显式栈求值时按等效的递归深度计算
+        self.option_sizes = Counter()  # 加法、取反、乘法结果的 (左集合大小, 右集合大小)
+        self._depth = 0
+    
+    def _hit(self, operator: str) -> None:
+        name = _NAMES[operator]
+        self.calls[name] += 1
+        self.hits[name] += 1
+    
+    def _enter(self) -> float:
+        self._depth += 1
+        if self._depth > self.max_depth:
+            self.max_depth = self._depth
+        
+        return perf_counter()
+    
+    def _exit(self, operator: str, start: float, result: object) -> None:
+        self._depth -= 1
+        name = _NAMES[operator]
+        self.calls[name] += 1
+        self.seconds[name] += perf_counter() - start
+        if operator != '<=':
+            self.option_sizes[len(result.left), len(result.right)] += 1
+    
+    def _record(self, name: str, start: float) -> None:
+        self.calls[name] += 1
+        self.seconds[name] += perf_counter() - start
+    
+    def _hash(self) -> Callable:  # 只在统计期间替换 __hash__，平时没有额外开销
+        def measured(number: 'BasicSurrealNumber') -> int:
+            start = perf_counter()
+            result = number._hash_value
+            self._record('__hash__', start)
+            
+            return result
+        
+        return measured
+    
+    def _mul_handler(self, handler: Callable) -> Callable:
+        def measured(*arguments: object) -> Iterator[Tuple]:
+            start = perf_counter()
+            result = yield from handler(*arguments)
+            self._record('_mul_handler', start)
+            
+            return result
+        
+        return measured
+    
+    def __str__(self) -> str:
+        lines = [f'{"name":<16}{"calls":>12}{"hits":>12}{"seconds":>14}']
+        for name in sorted(self.calls):
+            lines.append(f'{name:<16}{self.calls[name]:>12}{self.hits[name]:>12}{self.seconds[name]:>14.6f}')
+        lines.append(f'max depth: {self.max_depth}')
+        
+        return '\n'.join(lines)
+
+_profiler = None  # 为 None 时不做任何统计
+
+@contextmanager
+def instrument() -> Iterator[OperationStats]:
+    global _profiler
+    previous = _profiler
+    stats = _profiler = OperationStats()
+    previous_hash = BasicSurrealNumber.__hash__
+    BasicSurrealNumber.__hash__ = stats._hash()
+    try:
+        yield stats
+    finally:
+        _profiler = previous
+        BasicSurrealNumber.__hash__ = previous_hash
+
+_parallel = None  # (进程池, 进程数, 阈值)，选项组合数达到阈值的乘法交给进程池
+
+@contextmanager
+def parallel_multiplication(
+    workers: Optional[int] = None,
+    threshold: int = 64
+) -> Iterator[ProcessPoolExecutor]:  # x * y 的四组选项组合共有不少于 threshold 对时，所有组合一起交给进程池；默认的规范化方式下最多四对
+    global _parallel
+    previous = _parallel
+    workers = workers or cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_disable_parallel) as executor:
+        _parallel = (executor, workers, threshold)
+        try:
+            yield executor
+        finally:
+            _parallel = previous
+
+def _disable_parallel() -> None:  # 子进程内只做串行计算，避免嵌套创建进程
+    global _parallel
+    _parallel = None
+
+def encode_forms(forms: Sequence['BasicSurrealNumber']) -> Tuple[List[Tuple[Tuple[int, ...], Tuple[int, ...]]], List[int]]:
+    ids = {}  # 每个不同的节点只记录一次，子节点总在父节点之前，记录为 (左选项编号, 右选项编号)
+    records = []
+    for form in forms:
+        stack = [form]
+        while stack:
+            node = stack[-1]
+            if node in ids:
+                stack.pop()
+                continue
             
-        for left_member in left:
-            for right_member in right:
-                if left_member >= right_member:
-                    raise ArithmeticError('Not a valid surreal number: breaking law 1.')  # 根据定义判断合法性
+            pending = [member for member in node.left | node.right if member not in ids]
+            if pending:
+                stack.extend(pending)
+                continue
+            
+            stack.pop()
+            ids[node] = len(records)
+            records.append((tuple(ids[member] for member in node.left), tuple(ids[member] for member in node.right)))
+    
+    return records, [ids[form] for form in forms]
+
+def _decode_forms(cls: type, records: Sequence[Tuple[Sequence[int], Sequence[int]]]) -> List['BasicSurrealNumber']:
+    forms = []
+    for left, right in records:  # 数据由 encode_forms 从合法的数生成，不必再检查
+        forms.append(_intern(
+            cls, frozenset(forms[index] for index in left), frozenset(forms[index] for index in right), check=False
+        ))
+    
+    return forms
+
+def _mul_terms(
+    cls: type,
+    mode: Tuple[bool, bool],
+    records: List[Tuple[Tuple[int, ...], Tuple[int, ...]]],
+    roots: List[int]
+) -> Tuple[List[Tuple[Tuple[int, ...], Tuple[int, ...]]], List[int]]:  # 在子进程中执行，roots 依次是 x、y 和若干对 (x_member, y_member)
+    forms = _decode_forms(cls, records)
+    x, y = forms[roots[0]], forms[roots[1]]
+    with canonical_forms(*mode):
+        terms = [
+            forms[x_member] * y + forms[y_member] * x - forms[x_member] * forms[y_member]
+            for x_member, y_member in zip(roots[2::2], roots[3::2])
+        ]
+    
+    return encode_forms(terms)
+
+def _parallel_mul_groups(
+    x: 'SurrealNumber',
+    y: 'SurrealNumber',
+    groups: Sequence[Tuple[Set['SurrealNumber'], Set['SurrealNumber']]]
+) -> List[Set['SurrealNumber']]:  # 依次返回每组 (x_list, y_list) 的结果集合
+    executor, workers, _ = _parallel
+    pairs = [
+        (index, x_member, y_member)
+        for index, (x_list, y_list) in enumerate(groups) for x_member, y_member in product(x_list, y_list)
+    ]
+    chunk = -(-len(pairs) // workers)  # 平均分给每个进程，x 和 y 每批只需传一次
+    futures = []
+    for start in range(0, len(pairs), chunk):  # 先提交所有批次再等待结果，各批次同时计算
+        forms = [x, y]
+        for _, x_member, y_member in pairs[start:start + chunk]:
+            forms.extend((x_member, y_member))
+        futures.append((start, executor.submit(_mul_terms, x.__class__, _canonical_mode, *encode_forms(forms))))
+    
+    results = [set() for _ in groups]
+    for start, future in futures:
+        records, roots = future.result()
+        forms = _decode_forms(x.__class__, records)
+        for (index, _, _), root in zip(pairs[start:start + chunk], roots):
+            results[index].add(forms[root])
+    
+    return results
+
+_recursion_threshold = 200  # 操作数深度之和超过这个值时改用显式栈求值，避免超出解释器的递归深度
+
+def set_recursion_threshold(depth: int) -> int:  # 返回原来的值，方便恢复
+    global _recursion_threshold
+    previous = _recursion_threshold
+    _recursion_threshold = depth
+    
+    return previous
+
+# 以下每个生成器描述一种运算：需要子运算的结果时 yield (运算符, x, y)，由 _evaluate 或 _evaluate_iteratively 负责求值后送回
+
+def _less_equal_steps(x: 'BasicSurrealNumber', y: 'BasicSurrealNumber') -> Iterator[Tuple]:
+    for left_member in x.left:  # 检查前者的左集合里是否存在大于等于后者的数
+        if (yield '<=', y, left_member):
+            return False
+    
+    for right_member in y.right:  # 检查后者的右集合里是否存在小于等于前者的数
+        if (yield '<=', right_member, x):
+            return False
+    
+    return True
+
+def _add_steps(x: 'SurrealNumber', y: 'SurrealNumber') -> Iterator[Tuple]:
+    left_result = set()  # 这里是用于存储最终返回值的集合
+    right_result = set()
+    for left_member in x.left:
+        left_result.add((yield '+', y, left_member))
+    for right_member in x.right:
+        right_result.add((yield '+', y, right_member))
+    for left_member in y.left:  # 求并集
+        left_result.add((yield '+', x, left_member))
+    for right_member in y.right:
+        right_result.add((yield '+', x, right_member))
+    
+    return _build(x.__class__, left_result, right_result)
+
+def _neg_steps(x: 'SurrealNumber', _: None) -> Iterator[Tuple]:
+    left_result = set()
+    right_result = set()
+    for right_member in x.right:
+        left_result.add((yield '-', right_member, None))
+    for left_member in x.left:
+        right_result.add((yield '-', left_member, None))
+    
+    return x.__class__(left=left_result, right=right_result)
+
+def _mul_steps(x: 'SurrealNumber', y: 'SurrealNumber') -> Iterator[Tuple]:  # 操作逻辑与上方的 _add_steps 基本相同
+    groups = [(x.left, y.left), (x.left, y.right), (x.right, y.right), (x.right, y.left)]  # 左右集合符号相同的组合进入左集合
+    if _parallel is not None and sum(len(x_list) * len(y_list) for x_list, y_list in groups) >= _parallel[2]:
+        left_result, right_result, left_updater, right_updater = _parallel_mul_groups(x, y, groups)  # 各项互不依赖，可以并行计算
+    else:
+        handler = x._mul_handler if _profiler is None else _profiler._mul_handler(x._mul_handler)
+        left_result = yield from handler(x, y, x.left, y.left)
+        right_result = yield from handler(x, y, x.left, y.right)
+        left_updater = yield from handler(x, y, x.right, y.right)
+        right_updater = yield from handler(x, y, x.right, y.left)
+    
+    left_result = left_result.union(left_updater)
+    right_result = right_result.union(right_updater)
+    
+    return _build(x.__class__, left_result, right_result)
+
+_STEPS = {'<=': _less_equal_steps, '+': _add_steps, '-': _neg_steps, '*': _mul_steps}
+
+def _lookup(operator: str, x: 'BasicSurrealNumber', y: Optional['BasicSurrealNumber']) -> object:
+    if operator == '<=':
+        return True if x is y else compare_cache.get((x, y))
+    
+    cache = _operation_cache
+    return None if cache is None else cache.get(_operation_key(operator, x, y))
+
+def _store(operator: str, x: 'BasicSurrealNumber', y: Optional['BasicSurrealNumber'], result: object) -> None:
+    if operator == '<=':
+        compare_cache.put((x, y), result)
+        if not result:
+            compare_cache.put((y, x), True)  # 数是全序的，x <= y 不成立则 y <= x 必然成立
+    elif _operation_cache is not None:
+        _operation_cache.put(_operation_key(operator, x, y), result)
+
+def _evaluate(operator: str, x: 'BasicSurrealNumber', y: Optional['BasicSurrealNumber']) -> object:
+    result = _lookup(operator, x, y)
+    if result is not None:
+        if _profiler is not None:
+            _profiler._hit(operator)
+        return result
+    
+    if _profiler is None:
+        return _compute(operator, x, y)
+    
+    profiler = _profiler
+    start = profiler._enter()
+    result = _compute(operator, x, y)
+    profiler._exit(operator, start, result)
+    
+    return result
+
+def _compute(operator: str, x: 'BasicSurrealNumber', y: Optional['BasicSurrealNumber']) -> object:  # 缓存未命中时才真正计算
+    if x._depth + (0 if y is None else y._depth) > _recursion_threshold:
+        return _evaluate_iteratively(operator, x, y)
+    
+    steps = _STEPS[operator](x, y)
+    result = None
+    try:
+        while True:
+            result = _evaluate(*steps.send(result))  # 较浅的数直接递归，开销更小
+    except StopIteration as stop:
+        result = stop.value
+    
+    _store(operator, x, y, result)
+    return result
+
+def _evaluate_iteratively(operator: str, x: 'BasicSurrealNumber', y: Optional['BasicSurrealNumber']) -> object:
+    profiler = _profiler
+    stack = [(_STEPS[operator](x, y), operator, x, y, None)]  # 每一层保存运算的生成器、操作数和开始时间，相当于手动维护的调用栈
+    result = None
+    while stack:
+        steps, operator, x, y, start = stack[-1]
+        try:
+            request = steps.send(result)
+        except StopIteration as stop:
+            result = stop.value
+            _store(operator, x, y, result)
+            stack.pop()
+            if start is not None:
+                profiler._exit(operator, start, result)
+            continue
+        
+        result = _lookup(*request)
+        if result is None:
+            start = None if profiler is None else profiler._enter()
+            stack.append((_STEPS[request[0]](request[1], request[2]), *request, start))
+        elif profiler is not None:
+            profiler._hit(request[0])
+    
+    return result
+
+def _complexity(number: 'BasicSurrealNumber') -> Tuple[int, int, int]:  # 越早诞生、选项越少越简单，哈希值只用于让结果与遍历顺序无关
+    return number._depth, len(number.left) + len(number.right), number._hash_value
+
+def _extreme(options: Set['BasicSurrealNumber'], maximal: bool) -> 'BasicSurrealNumber':
+    best = None
+    for option in options:
+        if best is None:
+            best = option
+            continue
+        
+        order = compare(option, best)
+        if order == 0:
+            if _complexity(option) < _complexity(best):
+                best = option  # 值相同时保留较简单的那个
+        elif (order > 0) == maximal:
+            best = option
+    
+    return best
+
+def _simplest_between(lower: Optional[Fraction], upper: Optional[Fraction]) -> Fraction:  # 区间 (lower, upper) 中诞生最早的数，None 表示无界
+    if (lower is None or lower < 0) and (upper is None or upper > 0):
+        return Fraction(0)
+    
+    if lower is None or lower < 0:
+        return -_simplest_between(-upper, None if lower is None else -lower)  # 负数的情况与正数对称
+    
+    integer = floor(lower) + 1  # 先找绝对值最小的整数
+    if upper is None or integer < upper:
+        return Fraction(integer)
+    
+    denominator = 2
+    while True:  # 再找分母最小的二进分数，区间内分母最小的二进分数是唯一的
+        candidate = Fraction(floor(lower * denominator) + 1, denominator)
+        if candidate < upper:
+            return candidate
+        denominator *= 2
 
-        self.left = left
-        self.right = right
+def _value(number: 'BasicSurrealNumber') -> Fraction:  # 数对应的二进有理数，结果保存在节点上
+    if number._value is not None:
+        return number._value
     
-    def _hash(self) -> str:  # 返回一个递归生成的二进制的字符串，用于哈希
-        return ''.join(member._hash() for member in self.left) if self.left else '0' \
-               + '1' \
-               + ''.join(member._hash() for member in self.right) if self.right else '0'
+    stack = [number]  # 用栈代替递归，避免很深的数超出递归深度
+    while stack:
+        node = stack[-1]
+        pending = [member for member in node.left if member._value is None]
+        pending.extend(member for member in node.right if member._value is None)
+        if pending:
+            stack.extend(pending)
+            continue
+        
+        stack.pop()
+        lower = max((member._value for member in node.left), default=None)
+        upper = min((member._value for member in node.right), default=None)
+        object.__setattr__(node, '_value', _simplest_between(lower, upper))
+    
+    return number._value
+
+_canonical_forms = WeakValueDictionary()  # (类型, 值) 到最简形式的缓存，不再被引用时自动回收
+
+def _neighbours(value: Fraction) -> Tuple[Optional[Fraction], Optional[Fraction]]:  # 最简形式的左右选项的值，None 表示没有选项
+    if value.denominator == 1:
+        if value > 0:
+            return value - 1, None  # n = { n-1 | }
+        if value < 0:
+            return None, value + 1
+        return None, None
+    
+    step = Fraction(1, value.denominator)  # p / 2^k = { (p-1) / 2^k | (p+1) / 2^k }，两边都诞生得更早
+    return value - step, value + step
+
+def _canonical(cls: type, value: Fraction) -> 'BasicSurrealNumber':  # 构造某个二进有理数最简单的形式，已构造过的直接复用
+    if value.denominator & (value.denominator - 1):
+        raise ArithmeticError(f'Not a dyadic rational: {value}.')
+    
+    result = _canonical_forms.get((cls, value))
+    if result is not None:
+        return result
+    
+    built = {}  # 保持本次构造的节点存活，弱引用的缓存才不会提前丢失它们
+    stack = [value]  # 用栈代替递归，先构造选项再构造自身
+    while stack:
+        current = stack[-1]
+        if current in built:
+            stack.pop()
+            continue
+        
+        node = _canonical_forms.get((cls, current))
+        if node is not None:
+            built[current] = node
+            stack.pop()
+            continue
+        
+        lower, upper = _neighbours(current)
+        pending = [option for option in (lower, upper) if option is not None and option not in built]
+        if pending:
+            stack.extend(pending)
+            continue
+        
+        stack.pop()
+        node = cls(left=(built[lower],) if lower is not None else (), right=(built[upper],) if upper is not None else ())
+        object.__setattr__(node, '_value', current)
+        _canonical_forms[(cls, current)] = node
+        built[current] = node
+    
+    return built[value]
+
+def simplest_form(number: 'BasicSurrealNumber') -> 'BasicSurrealNumber':  # 与给定数相等的最简单的形式
+    return _canonical(number.__class__, _value(number))
+
+def _build(cls: type, left: Set['BasicSurrealNumber'], right: Set['BasicSurrealNumber']) -> 'BasicSurrealNumber':
+    prune, simplify = _canonical_mode
+    if prune:  # 左集合只需保留最大的数，右集合只需保留最小的数，其余选项不影响结果的值
+        left = {simplest_form(_extreme(left, maximal=True))} if left else set()  # 选项换成最简形式，深度不超过其诞生天数
+        right = {simplest_form(_extreme(right, maximal=False))} if right else set()
+    
+    result = cls(left=left, right=right)
+    
+    return simplest_form(result) if simplify else result
+
+def _check_options(left: Set['BasicSurrealNumber'], right: Set['BasicSurrealNumber']) -> None:
+    for left_member in left:
+        for right_member in right:
+            if left_member >= right_member:
+                raise ArithmeticError('Not a valid surreal number: breaking law 1.')  # 根据定义判断合法性
+
+def _intern(cls: type, left: frozenset, right: frozenset, check: bool = True) -> 'BasicSurrealNumber':  # check 为 False 时信任数据来源，跳过合法性检查
+    key = (cls, left, right)
+    self = _interned.get(key)
+    if self is not None:
+        return self  # 已经构造过结构相同的数，直接复用，也不必再检查合法性
+    
+    if check and _profiler is None:
+        _check_options(left, right)
+    elif check:
+        start = perf_counter()
+        _check_options(left, right)
+        _profiler._record('validity_check', start)
+    
+    self = object.__new__(cls)
+    object.__setattr__(self, 'left', left)
+    object.__setattr__(self, 'right', right)
+    object.__setattr__(self, '_hash_value', hash((left, right)))  # 子节点的哈希值已缓存，这里只需组合一次
+    object.__setattr__(self, '_depth', max((member._depth + 1 for member in left | right), default=0))
+    object.__setattr__(self, '_value', None)  # 需要时由 _value 计算
+    _interned[key] = self
+    
+    return self
+
+def compare(x: 'BasicSurrealNumber', y: 'BasicSurrealNumber') -> int:  # 返回 -1、0 或 1；一次遍历求出两个数的值（保存在节点上），两个方向同时确定
+    first, second = _value(x), _value(y)
+    return (first > second) - (first < second)
+
+class BasicSurrealNumber(object):
+    
+    __slots__ = ['left', 'right', '_hash_value', '_depth', '_value', '__weakref__']
+    
+    def __new__(
+        cls,
+        left: Iterable['BasicSurrealNumber'] = None,
+        right: Iterable['BasicSurrealNumber'] = None
+    ) -> 'BasicSurrealNumber':
+        return _intern(cls, frozenset(left) if left else frozenset(), frozenset(right) if right else frozenset())
+    
+    def __setattr__(self, name: str, value: object) -> None:  # 实例被共享，必须不可变
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+    
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{self.__class__.__name__} is immutable.')
+    
+    def __reduce__(self) -> tuple:  # 反序列化时重新走 __new__，保证仍然被共享
+        return self.__class__, (self.left, self.right)
     
     def __hash__(self) -> int:  # 必须有此方法，否则无法加入集合中
-        return int(self._hash(), 2)
+        return self._hash_value
+    
+    def __eq__(self, other: object) -> bool:  # 结构相同的数是同一个对象，所以比较身份即可
+        return self is other
     
-    def __le__(self, other: 'BasicSurrealNumber') -> bool:
-        return (not any(
-            left_member >= other for left_member in self.left  # 检查前者的左集合里是否存在大于等于后者的数
-        )) and (not any(
-            right_member <= self for right_member in other.right  # 检查后者的右集合里是否存在小于等于前者的数
-        ))  # 以上是语法糖，理解作用即可
+    def __le__(self, other: 'BasicSurrealNumber') -> bool:  # 具体逻辑见 _less_equal_steps，结果会被缓存
+        if not isinstance(other, BasicSurrealNumber):
+            return NotImplemented
+        
+        return _evaluate('<=', self, other)
     
     def __ge__(self, other: 'BasicSurrealNumber') -> bool:  # 这两个运算符号是等效的
-        return other <= self
+        if not isinstance(other, BasicSurrealNumber):
+            return NotImplemented
+        
+        return _evaluate('<=', other, self)
+    
+    def __lt__(self, other: 'BasicSurrealNumber') -> bool:  # 全序，x < y 等价于 y <= x 不成立；== 仍然比较结构，值相等用 compare
+        if not isinstance(other, BasicSurrealNumber):
+            return NotImplemented
+        
+        return not _evaluate('<=', other, self)
+    
+    def __gt__(self, other: 'BasicSurrealNumber') -> bool:
+        if not isinstance(other, BasicSurrealNumber):
+            return NotImplemented
+        
+        return not _evaluate('<=', self, other)
     
     def __str__(self) -> str:
-        left_part = ', '.join(str(member) for member in self.left)
-        right_part = ', '.join(str(member) for member in self.right)
-
-        if not left_part:
-            return f'{{ |{right_part}}}' if right_part else '.'
-        if not right_part:
-            return f'{{{left_part}| }}'
-
-        return f'{{{left_part}|{right_part}}}'
+        texts = {}  # 用栈代替递归，共享的子节点也只需生成一次
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            pending = [member for member in node.left | node.right if member not in texts]
+            if pending:
+                stack.extend(pending)
+                continue
+            
+            stack.pop()
+            left_part = ', '.join(texts[member] for member in node.left)
+            right_part = ', '.join(texts[member] for member in node.right)
+            
+            if not left_part:
+                texts[node] = f'{{ |{right_part}}}' if right_part else '.'
+            elif not right_part:
+                texts[node] = f'{{{left_part}| }}'
+            else:
+                texts[node] = f'{{{left_part}|{right_part}}}'
+        
+        return texts[self]
 
 class SurrealNumber(BasicSurrealNumber):  # 为了避免类过于复杂，将比较运算符和算术运算符分离
     
-    def __add__(self, other: 'SurrealNumber') -> 'SurrealNumber':
-        left_result = {other + left_member for left_member in self.left}  # 这里是用于存储最终返回值的集合
-        right_result = {other + right_member for right_member in self.right}
-        left_updater = {self + left_member for left_member in other.left}  # 这里是用于求并集的集合
-        right_updater = {self + right_member for right_member in other.right} 
+    __slots__ = ()
+    
+    def __add__(self, other: 'SurrealNumber') -> 'SurrealNumber':  # 具体逻辑见 _add_steps，下同
+        if not isinstance(other, BasicSurrealNumber):
+            return NotImplemented  # 交给对方的反射运算符，例如延迟求值的表达式
         
-        left_result = left_result.union(left_updater)  # 下面两行是求并集的操作
-        right_result = right_result.union(right_updater)
-
-        return self.__class__(left=left_result, right=right_result)
+        return _evaluate('+', self, other)
 
     def __neg__(self) -> 'SurrealNumber':
-        return self.__class__(
-            left={-right_member for right_member in self.right},
-            right={-left_member for left_member in self.left}
-        )
+        return _evaluate('-', self, None)
     
     def __sub__(self, other: 'SurrealNumber') -> 'SurrealNumber':
+        if not isinstance(other, BasicSurrealNumber):
+            return NotImplemented
+        
         return self + (-other)
 
     @staticmethod
@@ -76,74 +658,255 @@ class SurrealNumber(BasicSurrealNumber):  # 为了避免类过于复杂，将比
         y: 'SurrealNumber',
         x_list: Set['SurrealNumber'],
         y_list: Set['SurrealNumber']
-    ) -> Set['SurrealNumber']:
+    ) -> Iterator[Tuple]:  # 用 yield from 调用，返回 x_member * y + y_member * x - x_member * y_member 组成的集合
         
-        return {
-            x_member * y
-            + y_member * x
-            - x_member * y_member
-            for x_member, y_member in product(x_list, y_list)
-        }
+        result = set()
+        for x_member, y_member in product(x_list, y_list):
+            first = yield '*', x_member, y
+            second = yield '*', y_member, x
+            third = yield '*', x_member, y_member
+            partial = yield '+', first, second
+            negative = yield '-', third, None
+            result.add((yield '+', partial, negative))
+        
+        return result
 
-    def __mul__(self, other: 'SurrealNumber') -> 'SurrealNumber':  # 操作逻辑与上方的 __add__ 基本相同
-        left_result = self._mul_handler(self, other, self.left, other.left)
-        right_result = self._mul_handler(self, other, self.right, other.right)
-        left_updater = self._mul_handler(self, other, self.left, other.right)
-        right_updater = self._mul_handler(self, other, self.right, other.left)
+    def __mul__(self, other: 'SurrealNumber') -> 'SurrealNumber':
+        if not isinstance(other, BasicSurrealNumber):
+            return NotImplemented
         
-        left_result = left_result.union(left_updater)
-        right_result = right_result.union(right_updater)
+        return _evaluate('*', self, other)
+
+def values_born_on(day: int) -> Iterator[Fraction]:  # 第 day 天诞生的值，从小到大，不依赖之前各天的结果
+    if day == 0:
+        yield Fraction(0)
+        return
+    
+    yield Fraction(-day)
+    for integer in range(day - 2, -1, -1):  # m + p / 2^k 诞生于第 m + 1 + k 天，p 为奇数
+        denominator = 1 << (day - 1 - integer)
+        for numerator in range(denominator - 1, 0, -2):
+            yield -Fraction(integer * denominator + numerator, denominator)
+    
+    for integer in range(day - 1):
+        denominator = 1 << (day - 1 - integer)
+        for numerator in range(1, denominator, 2):
+            yield Fraction(integer * denominator + numerator, denominator)
+    yield Fraction(day)
+
+def surreal_numbers(
+    first_day: int = 0,
+    last_day: Optional[int] = None,
+    cls: type = SurrealNumber
+) -> Iterator['SurrealNumber']:  # 按天依次生成每个数最简单的形式，每个值只出现一次；last_day 为 None 时无限生成
+    day = first_day
+    while last_day is None or day <= last_day:
+        for value in values_born_on(day):
+            yield _canonical(cls, value)
+        day += 1
+
+def from_value(value: Fraction, cls: type = SurrealNumber) -> 'BasicSurrealNumber':  # 与二进有理数 value 相等的最简单的形式
+    return _canonical(cls, Fraction(value))
+
+def order_key(number: 'BasicSurrealNumber') -> Fraction:  # 值相等的数得到相等的键，键的大小关系与数相同；结果保存在节点上
+    return _value(number)
+
+def sort_surreals(numbers: Iterable['BasicSurrealNumber'], reverse: bool = False) -> List['BasicSurrealNumber']:  # 稳定排序，每个数只计算一次键
+    return sorted(numbers, key=_value, reverse=reverse)
+
+def unique_by_value(numbers: Iterable['BasicSurrealNumber']) -> List['BasicSurrealNumber']:  # 每个值只保留第一次出现的数，保持原有顺序
+    seen = set()
+    result = []
+    for number in numbers:
+        key = _value(number)
+        if key not in seen:
+            seen.add(key)
+            result.append(number)
+    
+    return result
 
-        return self.__class__(left=left_result, right=right_result)
+def bisect_left(numbers: Sequence['BasicSurrealNumber'], number: 'BasicSurrealNumber', low: int = 0, high: Optional[int] = None) -> int:  # numbers 须按值排好序，只对访问到的元素取键
+    key = _value(number)
+    high = len(numbers) if high is None else high
+    while low < high:
+        middle = (low + high) // 2
+        if _value(numbers[middle]) < key:
+            low = middle + 1
+        else:
+            high = middle
+    
+    return low
+
+def bisect_right(numbers: Sequence['BasicSurrealNumber'], number: 'BasicSurrealNumber', low: int = 0, high: Optional[int] = None) -> int:
+    key = _value(number)
+    high = len(numbers) if high is None else high
+    while low < high:
+        middle = (low + high) // 2
+        if key < _value(numbers[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    
+    return low
+
+def insort(numbers: List['BasicSurrealNumber'], number: 'BasicSurrealNumber') -> None:  # 插入到值相等的数之后
+    numbers.insert(bisect_right(numbers, number), number)
 
-class SurrealNumberClass(object):
+class SurrealNumberClass(object):  # 值相等的数组成的类，合并时用并查集，数据只保存在根节点上
     
-    __slot__ = ['representation', 'left', 'right']
+    __slots__ = ['_parent', '_group', '_representation']
     
     def __init__(self, group: Union['SurrealNumber', 'SurrealNumberClass', Set['SurrealNumber']]) -> None:
-        self.group = set()
-        self.representation = None
+        self._parent = self
+        self._group = set()
+        self._representation = None
         if isinstance(group, set):
-            while group.len():
-                self.add_member(group.pop())
+            for member in group:
+                self.add_member(member)  # 与第一个数不相等的数会被忽略
         
         elif isinstance(group, SurrealNumber):
-            self.group.add(group)
-            self.representation = group
+            self.add_member(group)
         
         else:
-            self.representation = group.representation
             self.merge(group)
     
-    def add_member(self, member: 'SurrealNumber') -> None:
-        if self.representation is None:
-            self.representation = member
-            self.group.add(member)
-
-        elif self.representation >= member and self.representation <= member:
-            self.group.add(member)
-            if len(member.left) + len(member.right) < len(self.representation.left) + len(self.representation.right):
-                self.representation = member
-                
-    def merge(self, other: 'SurrealNumberClass') -> None:
-        if self.representation <= other.representation and self.representation >= other.representation:
-            self.group.update(other.group)
-            other.group = self.group.copy()
-        
-        if len(other.representation.left) + len(other.representation.right) < len(self.representation.left) + len(self.representation.right):
-            self.representation = other.representation
-        else:
-            other.representation = self.representation
+    def _find(self) -> 'SurrealNumberClass':
+        root = self
+        while root._parent is not root:
+            root = root._parent
+        
+        node = self
+        while node._parent is not root:  # 路径压缩，之后查找只需一步
+            node._parent, node = root, node._parent
+        
+        return root
+    
+    @property
+    def group(self) -> Set['SurrealNumber']:
+        return self._find()._group
+    
+    @property
+    def representation(self) -> Optional['SurrealNumber']:  # 类中最简单的数
+        return self._find()._representation
+    
+    def add_member(self, member: 'SurrealNumber') -> bool:  # 只与代表元比较一次，返回是否加入
+        root = self._find()
+        if root._representation is None:
+            root._representation = member
+            root._group.add(member)
+            return True
+        
+        if member in root._group:
+            return True
+        if compare(root._representation, member) != 0:
+            return False
+        
+        root._group.add(member)
+        if _complexity(member) < _complexity(root._representation):
+            root._representation = member
+        
+        return True
+    
+    def merge(self, other: 'SurrealNumberClass') -> bool:  # 返回两个类是否已经合并
+        root = self._find()
+        other_root = other._find()
+        if root is other_root:
+            return True
+        if (
+            root._representation is not None
+            and other_root._representation is not None
+            and compare(root._representation, other_root._representation) != 0
+        ):
+            return False
+        
+        if len(root._group) < len(other_root._group):
+            root, other_root = other_root, root  # 按大小合并，只把较小的集合并入较大的集合
+        
+        other_root._parent = root
+        root._group.update(other_root._group)
+        other_root._group = set()
+        if root._representation is None or (
+            other_root._representation is not None
+            and _complexity(other_root._representation) < _complexity(root._representation)
+        ):
+            root._representation = other_root._representation
+        other_root._representation = None
+        
+        return True
     
     def __add__(self, other: 'SurrealNumberClass') -> 'SurrealNumberClass':  # 对数集做运算的结果是对数集中每个数做运算
-        result = self.__class__
+        result = self.__class__(set())
         for self_member, other_member in product(self.group, other.group):
             result.add_member(self_member + other_member)
         
         return result
 
+class SurrealNumberRegistry(object):  # 按值给大量的数分类，各类的代表元按大小排列，插入时二分查找
+    
+    __slots__ = ['_classes', '_index']
+    
+    def __init__(self, members: Iterable['SurrealNumber'] = ()) -> None:
+        self._classes = []  # 按代表元从小到大排列
+        self._index = {}  # 已经加入的数到所在类的映射
+        for member in members:
+            self.add(member)
+    
+    def _search(self, member: 'SurrealNumber') -> Tuple[int, bool]:  # 返回插入位置以及该位置的类是否与 member 相等
+        low, high = 0, len(self._classes)
+        while low < high:
+            middle = (low + high) // 2
+            order = compare(member, self._classes[middle].representation)  # 比较结果有缓存
+            if order == 0:
+                return middle, True
+            if order < 0:
+                high = middle
+            else:
+                low = middle + 1
+        
+        return low, False
+    
+    def add(self, member: 'SurrealNumber') -> SurrealNumberClass:
+        group = self._index.get(member)
+        if group is not None:
+            return group._find()
+        
+        position, found = self._search(member)
+        if found:
+            group = self._classes[position]._find()
+            group.add_member(member)
+        else:
+            group = SurrealNumberClass(member)
+            self._classes.insert(position, group)
+        self._index[member] = group
+        
+        return group
+    
+    def find(self, member: 'SurrealNumber') -> Optional[SurrealNumberClass]:  # 找到与 member 相等的类，不加入
+        group = self._index.get(member)
+        if group is not None:
+            return group._find()
+        
+        position, found = self._search(member)
+        return self._classes[position]._find() if found else None
+    
+    def classes(self) -> List[SurrealNumberClass]:
+        return [group._find() for group in self._classes]
+    
+    def __contains__(self, member: 'SurrealNumber') -> bool:
+        return self.find(member) is not None
+    
+    def __len__(self) -> int:
+        return len(self._classes)
+
 BSN = BasicSurrealNumber
 SN = SurrealNumber
 SNC = SurrealNumberClass
+SNR = SurrealNumberRegistry
 
-__all__ = ['BSN', 'BasicSurrealNumber', 'SN', 'SurrealNumber']
+__all__ = [
+    'BSN', 'BasicSurrealNumber', 'SN', 'SurrealNumber', 'SNC', 'SurrealNumberClass', 'SNR', 'SurrealNumberRegistry',
+    'LRUCache', 'compare', 'compare_cache', 'get_operation_cache', 'use_operation_cache',
+    'canonical_forms', 'get_canonical_mode', 'simplest_form', 'from_value', 'surreal_numbers', 'values_born_on',
+    'encode_forms', 'set_recursion_threshold', 'parallel_multiplication',
+    'OperationStats', 'instrument', 'order_key', 'sort_surreals', 'unique_by_value', 'bisect_left', 'bisect_right', 'insort'
+]
@@ -1,6 +1,13 @@
+from concurrent.futures import Future
+from fractions import Fraction
 from unittest import TestCase, TestSuite, TextTestRunner
 
-from surreal_number import BSN, SN, SNC
+from surreal_number import (
+    BSN, SN, SNC, SNR, LRUCache, bisect_left, bisect_right, canonical_forms, compare, compare_cache,
+    from_value, get_canonical_mode, get_operation_cache, insort, instrument, order_key, parallel_multiplication,
+    set_recursion_threshold, simplest_form, sort_surreals, surreal_numbers, unique_by_value, use_operation_cache,
+    values_born_on
+)
 
 class BasicSurrealNumberTest(TestCase):
 
@@ -46,6 +53,85 @@ class BasicSurrealNumberTest(TestCase):
         self.assertFalse(beta >= alpha)  # 以下表达的是原博客中的第二个例子的后半句话
         self.assertFalse(alpha >= gamma)
         self.assertFalse(beta >= gamma)
+    
+    def test_intern(self) -> None:
+        alpha = self.alpha
+        beta = self.beta
+        
+        self.assertIs(BSN(left=set(), right={alpha}), beta)  # 结构相同的数是同一个对象
+        self.assertIs(BSN(right=[BSN()]), beta)
+        self.assertEqual(hash(BSN(right={alpha})), hash(beta))
+        self.assertIsNot(SN(right={SN()}), beta)  # 不同类型的数不共享
+        self.assertFalse(hasattr(alpha, '__dict__'))
+        
+        with self.assertRaises(AttributeError):
+            beta.left = {alpha}  # 共享的实例不可修改
+    
+    def test_compare_cache(self) -> None:
+        alpha = self.alpha
+        beta = self.beta
+        gamma = self.gamma
+        delta = self.delta
+        
+        self.assertEqual(compare(beta, gamma), -1)
+        self.assertEqual(compare(gamma, beta), 1)
+        self.assertEqual(compare(delta, alpha), 0)  # { -1 | 1 } 等于 0
+        
+        wide, half = SN(left={beta, alpha}, right={gamma}), SN(left={alpha}, right={gamma})  # 构造时的合法性检查会用到缓存
+        compare_cache.clear()
+        self.assertEqual(compare(wide, half), 0)
+        self.assertEqual(len(compare_cache), 0)  # 两个方向由节点的值一次确定，不需要 <= 的遍历
+        
+        self.assertTrue(delta <= alpha)
+        misses = compare_cache.info().misses
+        self.assertTrue(delta <= alpha)
+        self.assertEqual(compare_cache.info().misses, misses)  # 第二次比较直接命中缓存
+        self.assertGreater(compare_cache.info().hits, 0)
+        
+        compare_cache.resize(1)
+        self.assertLessEqual(len(compare_cache), 1)
+        self.assertTrue(beta <= delta <= gamma)  # 缓存变小不影响结果
+        compare_cache.resize(1 << 16)
+    
+    def test_lru_cache(self) -> None:
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)  # 淘汰最久未使用的 'b'
+        
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info(), (2, 1, 2, 2))
+    
+    def test_order(self) -> None:
+        zero = BSN()
+        one = BSN(left={zero})
+        other_one = BSN(left={zero, BSN(right={zero})})  # 与 one 相等但形式不同
+        minus_one = BSN(right={zero})
+        self.assertTrue(minus_one < zero < one)
+        self.assertFalse(one < other_one or one > other_one)
+        self.assertTrue(one != other_one)  # == 仍然比较结构
+        self.assertEqual(order_key(one), order_key(other_one))
+        self.assertIs(min([one, minus_one, zero]), minus_one)
+        self.assertIs(max([one, minus_one, zero]), one)
+        
+        numbers = list(surreal_numbers(last_day=4, cls=BSN))
+        shuffled = numbers[::-1] + [other_one]
+        ordered = sort_surreals(shuffled)
+        self.assertEqual([order_key(number) for number in ordered], sorted(order_key(number) for number in shuffled))
+        self.assertEqual(ordered, sorted(shuffled))
+        self.assertIs(ordered[ordered.index(one) + 1], other_one)  # 稳定排序
+        self.assertEqual(sort_surreals(shuffled, reverse=True)[0], numbers[-1])
+        
+        unique = unique_by_value(shuffled)
+        self.assertEqual(unique, numbers[::-1])
+        self.assertEqual(bisect_left(ordered, other_one), ordered.index(one))
+        self.assertEqual(bisect_right(ordered, one), ordered.index(other_one) + 1)
+        
+        values = sort_surreals(numbers[:8])
+        insort(values, other_one)
+        self.assertEqual(values, sort_surreals(numbers[:8] + [other_one]))
 
 class SurrealNumberTest(TestCase):
     
@@ -108,23 +194,302 @@ class SurrealNumberTest(TestCase):
         self.assertTrue(beta <= alpha)  # 原博客乘法的第二个例子，不等式的另一个公理
         self.assertTrue(beta <= gamma)
         self.assertTrue(beta * delta <= gamma * delta)
+        
+        self.assertEqual(compare(beta * beta, gamma), 0)  # 负负得正
+        self.assertEqual(compare(beta * gamma, beta), 0)
+    
+    def test_operation_cache(self) -> None:
+        beta = self.beta
+        gamma = self.gamma
+        delta = self.delta
+        
+        with use_operation_cache(LRUCache(1024)) as cache:
+            product = gamma * delta
+            hits = cache.info().hits
+            self.assertIs(delta * gamma, product)  # 交换操作数也能命中
+            self.assertEqual(cache.info().hits, hits + 1)
+            
+            self.assertIs(-delta, -delta)
+            self.assertLessEqual(len(cache), 1024)
+        
+        with use_operation_cache(None):
+            self.assertIsNone(get_operation_cache())
+            self.assertIs(gamma * delta, product)  # 关闭缓存后结果不变
+            self.assertIs(beta + gamma, gamma + beta)
+        
+        self.assertIsNotNone(get_operation_cache())
+    
+    def test_default_forms(self) -> None:  # 默认只剪枝时，保留的选项都是最简形式，深度不超过选项的诞生天数加一
+        numbers = list(surreal_numbers(4, 4))
+        for x in numbers:
+            for y in numbers:
+                product = x * y
+                self.assertEqual(order_key(product), order_key(x) * order_key(y))
+                for option in product.left | product.right:
+                    self.assertIs(option, simplest_form(option))
+        
+        three = simplest_form(SN(left={SN(left={SN(left={SN()})})}))
+        self.assertEqual(str(three * three), '{' * 9 + '.' + '| }' * 9)
+        
+        forms = {order_key(number): number for number in surreal_numbers(last_day=3)}
+        half, three_quarters = forms[Fraction(1, 2)], forms[Fraction(3, 4)]
+        value = order_key(half)
+        x = half
+        for _ in range(6):
+            x = x * three_quarters + half
+            value = value * Fraction(3, 4) + Fraction(1, 2)
+            self.assertEqual(order_key(x), value)
+            self.assertLessEqual(x._depth, max(simplest_form(option)._depth for option in x.left | x.right) + 1)
+    
+    def test_canonical_forms(self) -> None:
+        alpha = self.alpha
+        beta = self.beta
+        gamma = self.gamma
+        delta = self.delta
+        half = SN(left={alpha}, right={gamma})
+        
+        with canonical_forms(prune=False):
+            full = (delta + half) * half  # 不剪枝时选项数量随运算急剧增长
+        pruned = (delta + half) * half
+        self.assertGreater(len(full.left) + len(full.right), 2)
+        self.assertLessEqual(len(pruned.left), 1)  # 剪枝后只留下最大的左选项和最小的右选项
+        self.assertLessEqual(len(pruned.right), 1)
+        self.assertEqual(compare(full, pruned), 0)
+        
+        with canonical_forms(simplify=True):
+            simplest = (gamma + half) * (gamma + delta)
+        self.assertEqual(str(simplest), '{{.| }|{{.| }| }}')  # 3/2 = { 1 | 2 }
+        self.assertEqual(compare(simplest, gamma + half), 0)
+        
+        self.assertIs(simplest_form(delta), alpha)  # { -1 | 1 } 最简形式是 0
+        self.assertIs(simplest_form(beta + gamma), alpha)
+        self.assertIs(simplest_form(half + half), gamma)
+        
+        self.assertEqual(get_canonical_mode(), (True, False))
+        with canonical_forms(simplify=True):
+            self.assertEqual(get_canonical_mode(), (True, True))
+    
+    def test_generate(self) -> None:
+        alpha = self.alpha
+        beta = self.beta
+        gamma = self.gamma
+        
+        self.assertEqual(list(surreal_numbers(last_day=1)), [alpha, beta, gamma])
+        self.assertEqual(
+            [str(number) for number in surreal_numbers(2, 2)],
+            ['{ |{ |.}}', '{{ |.}|.}', '{.|{.| }}', '{{.| }| }']
+        )  # 第二天诞生的 -2, -1/2, 1/2, 2
+        
+        numbers = list(surreal_numbers(last_day=5))
+        self.assertEqual(len(numbers), 2 ** 6 - 1)
+        self.assertEqual(len(set(numbers)), len(numbers))  # 最简形式唯一，结构不同即值不同
+        
+        for day in range(5):
+            born = list(surreal_numbers(day, day))
+            self.assertEqual(len(born), 2 ** day)
+            for first, second in zip(born, born[1:]):
+                self.assertEqual(compare(first, second), -1)  # 同一天的数从小到大且互不相等
+            for number, value in zip(born, values_born_on(day)):
+                self.assertIs(simplest_form(number), number)
+                self.assertIs(from_value(value), number)
+                self.assertEqual(order_key(number), value)
+        
+        self.assertIs(from_value(1), gamma)
+        with self.assertRaises(ArithmeticError):
+            from_value(Fraction(1, 3))
+    
+    def test_deep_forms(self) -> None:
+        alpha = self.alpha
+        gamma = self.gamma
+        
+        deep = alpha
+        for _ in range(3000):  # 远超解释器默认的递归深度
+            deep = SN(left={deep})
+        deeper = SN(left={deep})
+        
+        self.assertEqual(compare(deep, deeper), -1)
+        self.assertEqual(compare(-deeper, -deep), -1)
+        self.assertIs(deep + gamma, deeper)
+        self.assertEqual(str(deeper), '{' * 3001 + '.' + '| }' * 3001)
+    
+    def test_iterative_evaluation(self) -> None:
+        beta = self.beta
+        gamma = self.gamma
+        delta = self.delta
+        half = SN(left={self.alpha}, right={gamma})
+        four = gamma + gamma + gamma + gamma
+        
+        recursive = [four * half, beta - four, four * delta + half, four <= half * four]
+        
+        compare_cache.clear()
+        previous = set_recursion_threshold(0)  # 所有运算都走显式栈
+        try:
+            with use_operation_cache(LRUCache()):
+                iterative = [four * half, beta - four, four * delta + half, four <= half * four]
+        finally:
+            set_recursion_threshold(previous)
+        
+        for first, second in zip(recursive, iterative):
+            self.assertIs(first, second)  # 两种求值方式的结果完全一致
+    
+    def test_parallel_multiply(self) -> None:
+        gamma = self.gamma
+        delta = self.delta
+        half = SN(left={self.alpha}, right={gamma})
+        
+        with canonical_forms(prune=False):
+            wide = delta + half  # 左右集合各有两个选项
+            serial = [wide * half, (gamma + half) * half]
+        
+        with use_operation_cache(LRUCache()), canonical_forms(prune=False):
+            with parallel_multiplication(workers=2, threshold=2):
+                parallel = [wide * half, (gamma + half) * half]
+        
+        for first, second in zip(serial, parallel):
+            self.assertIs(first, second)  # 并行计算的结果与串行完全一致
+        
+        numbers = list(surreal_numbers(last_day=3))
+        serial = [x * y for x in numbers[::3] for y in numbers[1::3]]
+        pending = []  # 每次提交或等待后尚未取回结果的批次数
+        with use_operation_cache(LRUCache()):  # 默认的规范化方式下每组最多一对，四组一起提交
+            with parallel_multiplication(workers=4, threshold=2) as executor:
+                submit = executor.submit
+                
+                def tracked_submit(*args: object) -> Future:
+                    future = submit(*args)
+                    result = future.result
+                    
+                    def tracked_result() -> object:
+                        pending.append(pending[-1] - 1)
+                        return result()
+                    
+                    future.result = tracked_result
+                    pending.append(pending[-1] + 1 if pending else 1)
+                    return future
+                
+                executor.submit = tracked_submit
+                parallel = [x * y for x in numbers[::3] for y in numbers[1::3]]
+        
+        self.assertGreater(max(pending), 1)  # 有多个批次同时在计算
+        for first, second in zip(serial, parallel):
+            self.assertIs(first, second)
+    
+    def test_instrument(self) -> None:
+        gamma = self.gamma
+        delta = self.delta
+        half = SN(left={self.alpha}, right={gamma})
+        hash_function = SN.__hash__
+        
+        reports = []
+        for threshold in [200, 0]:  # 递归求值和显式栈求值的统计结果应当一致
+            compare_cache.clear()
+            previous = set_recursion_threshold(threshold)
+            try:
+                with use_operation_cache(LRUCache()), instrument() as stats:
+                    (gamma + half) * half - delta
+                    SN(left={self.alpha, half}, right={gamma})  # 剪枝不会产生两个左选项，保证是新构造的数
+            finally:
+                set_recursion_threshold(previous)
+            reports.append(stats)
+        
+        recursive, iterative = reports
+        for name in ['__le__', '__add__', '__neg__', '__mul__', '_mul_handler', '__hash__', 'validity_check']:
+            self.assertGreater(recursive.calls[name], 0)
+        self.assertEqual(recursive.calls, iterative.calls)
+        self.assertEqual(recursive.hits, iterative.hits)
+        self.assertEqual(recursive.max_depth, iterative.max_depth)
+        self.assertGreater(recursive.max_depth, 1)
+        self.assertEqual(sum(recursive.option_sizes.values()), sum(
+            recursive.calls[name] - recursive.hits[name] for name in ['__add__', '__neg__', '__mul__']
+        ))
+        self.assertIn('__mul__', str(recursive))
+        
+        self.assertIs(SN.__hash__, hash_function)  # 退出后恢复原来的 __hash__
 
 class SurrealNumberClassTest(TestCase):
     
     def setUp(self) -> None:
-        ...
+        self.alpha = alpha = SN()
+        self.beta = beta = SN(left=set(), right={alpha})
+        self.gamma = gamma = SN(left={alpha}, right=set())
+        self.delta = SN(left={beta}, right={gamma})  # 与 alpha 相等
+        self.epsilon = SN(left={beta}, right=set())  # 同样等于 0
     
     def test_initialize(self) -> None:
-        ...
+        alpha = self.alpha
+        gamma = self.gamma
+        delta = self.delta
+        
+        group = SNC({delta, alpha, gamma})
+        self.assertEqual(len(group.group), 2 if group.representation is alpha else 1)  # gamma 与其他数不相等，不会加入
+        self.assertIs(SNC(delta).representation, delta)
+        self.assertIs(SNC(SNC(delta)).representation, delta)
     
     def test_add_member(self) -> None:
-        ...
+        alpha = self.alpha
+        gamma = self.gamma
+        delta = self.delta
+        
+        group = SNC(delta)
+        self.assertTrue(group.add_member(alpha))
+        self.assertFalse(group.add_member(gamma))
+        self.assertEqual(group.group, {alpha, delta})
+        self.assertIs(group.representation, alpha)  # 代表元是最简单的数
     
     def test_merge(self) -> None:
-        ...
+        alpha = self.alpha
+        gamma = self.gamma
+        delta = self.delta
+        epsilon = self.epsilon
+        
+        first = SNC(delta)
+        second = SNC(epsilon)
+        second.add_member(alpha)
+        self.assertTrue(first.merge(second))
+        self.assertIs(first.group, second.group)  # 合并后共用同一个集合，不再复制
+        self.assertEqual(first.group, {alpha, delta, epsilon})
+        self.assertIs(first.representation, alpha)
+        
+        self.assertFalse(first.merge(SNC(gamma)))
+        self.assertTrue(first.merge(second))
+        
+        chain = [SNC(alpha) for _ in range(10)]
+        for previous, current in zip(chain, chain[1:]):
+            current.merge(previous)
+        self.assertIs(chain[0].group, chain[-1].group)
+        self.assertEqual(chain[0].group, {alpha})
     
     def test_add(self) -> None:
-        ...
+        alpha = self.alpha
+        beta = self.beta
+        gamma = self.gamma
+        delta = self.delta
+        
+        zero = SNC({alpha, delta})
+        one = SNC(gamma)
+        result = zero + one  # 0 + 1 = 1
+        
+        self.assertEqual(len(result.group), len(set(member + gamma for member in zero.group)))
+        self.assertEqual(compare(result.representation, gamma), 0)
+        self.assertEqual(compare((one + SNC(beta)).representation, alpha), 0)
+    
+    def test_registry(self) -> None:
+        alpha = self.alpha
+        beta = self.beta
+        gamma = self.gamma
+        delta = self.delta
+        epsilon = self.epsilon
+        
+        registry = SNR([gamma, delta, beta, epsilon, alpha, gamma + beta])
+        self.assertEqual(len(registry), 3)
+        self.assertEqual([group.representation for group in registry.classes()], [beta, alpha, gamma])  # 按值从小到大
+        
+        zero = registry.find(delta)
+        self.assertEqual(zero.group, {alpha, delta, epsilon, gamma + beta})
+        self.assertIs(registry.add(alpha), zero)
+        self.assertIn(beta + beta + gamma, registry)
+        self.assertNotIn(gamma + gamma, registry)
+        self.assertIsNone(registry.find(gamma + gamma))
 
 if __name__ == '__main__':
     suite = TestSuite()
@@ -132,8 +497,27 @@ if __name__ == '__main__':
     suite.addTest(BasicSurrealNumberTest('test_construct'))
     suite.addTest(BasicSurrealNumberTest('test_output'))
     suite.addTest(BasicSurrealNumberTest('test_compare'))
+    suite.addTest(BasicSurrealNumberTest('test_intern'))
+    suite.addTest(BasicSurrealNumberTest('test_compare_cache'))
+    suite.addTest(BasicSurrealNumberTest('test_lru_cache'))
+    suite.addTest(BasicSurrealNumberTest('test_order'))
     
     suite.addTest(SurrealNumberTest('test_additive_associativity'))
+    suite.addTest(SurrealNumberTest('test_multiply'))
+    suite.addTest(SurrealNumberTest('test_operation_cache'))
+    suite.addTest(SurrealNumberTest('test_default_forms'))
+    suite.addTest(SurrealNumberTest('test_canonical_forms'))
+    suite.addTest(SurrealNumberTest('test_generate'))
+    suite.addTest(SurrealNumberTest('test_deep_forms'))
+    suite.addTest(SurrealNumberTest('test_iterative_evaluation'))
+    suite.addTest(SurrealNumberTest('test_parallel_multiply'))
+    suite.addTest(SurrealNumberTest('test_instrument'))
+    
+    suite.addTest(SurrealNumberClassTest('test_initialize'))
+    suite.addTest(SurrealNumberClassTest('test_add_member'))
+    suite.addTest(SurrealNumberClassTest('test_merge'))
+    suite.addTest(SurrealNumberClassTest('test_add'))
+    suite.addTest(SurrealNumberClassTest('test_registry'))
     
     runner = TextTestRunner()
     runner.run(suite)